@@ -1,10 +1,15 @@
 """
 API客户端工厂类，管理不同平台的API客户端创建
 """
-from typing import Dict, Type, Optional
+from typing import Any, Dict, List, Tuple, Type, Optional
+import asyncio
+import inspect
 import logging
+from urllib.parse import urlsplit
 
-from .base_api import BaseAPIClient
+from . import async_runner
+from .base_api import BaseAPIClient, close_shared_session, close_shared_sessions
+from .rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,10 @@ class APIClientFactory:
     
     # 注册的API客户端类
     _clients: Dict[str, Type[BaseAPIClient]] = {}
+    # 已创建的客户端实例，key 为 (平台, API地址, 访问令牌, 选项)，相同配置复用同一实例及其响应缓存
+    _instances: Dict[Tuple[Any, ...], BaseAPIClient] = {}
+    # 每个API主机一个限流器，同一主机的所有客户端（不同令牌、不同选项）共享速率配额
+    _limiters: Dict[str, AsyncRateLimiter] = {}
     
     @classmethod
     def register_client(cls, platform: str, client_class: Type[BaseAPIClient]) -> None:
@@ -26,12 +35,43 @@ class APIClientFactory:
         Args:
             platform: 平台名称（如 'gitee', 'github'）
             client_class: API客户端类
+            
+        Raises:
+            TypeError: 客户端类不是 BaseAPIClient 的子类，或接口方法不是协程函数
         """
+        if not issubclass(client_class, BaseAPIClient):
+            raise TypeError(f"{client_class.__name__} 必须继承 BaseAPIClient")
+        # 同步实现会在共享事件循环中阻塞所有请求，注册时直接拒绝
+        blocking = [name for name in ("get_pr_labels", "get_pr_details", "get_author_prs")
+                    if not inspect.iscoroutinefunction(getattr(client_class, name))]
+        if blocking:
+            raise TypeError(f"{client_class.__name__} 的接口方法必须是异步方法: {blocking}")
         cls._clients[platform.lower()] = client_class
         logger.info(f"注册API客户端: {platform} -> {client_class.__name__}")
     
     @classmethod
-    def create_client(cls, platform: str, api_url: str, access_token: str) -> Optional[BaseAPIClient]:
+    def get_rate_limiter(cls, api_url: str, rate: Optional[float] = None) -> AsyncRateLimiter:
+        """
+        获取API主机共享的限流器
+        
+        Args:
+            api_url: API基础URL
+            rate: 每秒请求数，指定且与当前速率不同时更新限流器
+            
+        Returns:
+            该主机的限流器
+        """
+        host = urlsplit(api_url).netloc
+        limiter = cls._limiters.get(host)
+        if limiter is None:
+            limiter = cls._limiters[host] = AsyncRateLimiter(rate=rate if rate is not None else 10)
+        elif rate is not None and rate != limiter.base_rate:
+            limiter.set_rate(rate)
+        return limiter
+    
+    @classmethod
+    def create_client(cls, platform: str, api_url: str, access_token: str, warm_up: bool = True,
+                      **options: Any) -> Optional[BaseAPIClient]:
         """
         创建API客户端实例
         
@@ -39,28 +79,75 @@ class APIClientFactory:
             platform: 平台名称（如 'gitee', 'github'）
             api_url: API基础URL
             access_token: 访问令牌
+            warm_up: 是否在后台事件循环中预热到API服务器的连接
+            **options: 传给客户端构造函数的其他选项（如 cache_ttl、http2）；
+                rate_limit 用于该主机共享的限流器
             
         Returns:
             API客户端实例，如果平台不支持则返回None
         """
         platform_key = platform.lower()
+        limiter = cls.get_rate_limiter(api_url, options.pop("rate_limit", None))
+        instance_key = (platform_key, api_url, access_token, tuple(sorted(options.items())))
+        client = cls._instances.get(instance_key)
+        if client is not None:
+            return client
         
-        if platform_key not in cls._clients:
+        client_class = cls._clients.get(platform_key)
+        if client_class is None:
             logger.error(f"不支持的平台: {platform}. 支持的平台: {list(cls._clients.keys())}")
             return None
         
-        client_class = cls._clients[platform_key]
         try:
-            client = client_class(api_url, access_token)
-            if not client.validate_config():
-                logger.error(f"API客户端配置无效: {platform}")
-                return None
-            
-            logger.info(f"成功创建API客户端: {platform}")
-            return client
-        except Exception as e:
+            client = client_class(api_url, access_token, rate_limiter=limiter, **options)
+        except (TypeError, ValueError) as e:
             logger.error(f"创建API客户端失败 ({platform}): {e}")
             return None
+        
+        if not client.validate_config():
+            logger.error(f"API客户端配置无效: {platform}")
+            return None
+        
+        if warm_up:
+            # 不等待预热完成，连接建立后留在共享连接池中
+            asyncio.run_coroutine_threadsafe(client.warm_up(), async_runner.get_loop())
+        
+        cls._evict_stale(platform_key, api_url, access_token)
+        cls._instances[instance_key] = client
+        logger.info(f"成功创建API客户端: {platform}")
+        return client
+    
+    @classmethod
+    def _evict_stale(cls, platform_key: str, api_url: str, access_token: str) -> None:
+        """
+        移除同一平台和API地址下使用旧令牌的客户端实例，并在后台关闭它们的会话
+        
+        Args:
+            platform_key: 平台名称（小写）
+            api_url: API基础URL
+            access_token: 当前使用的访问令牌
+        """
+        stale = [key for key in cls._instances
+                 if key[0] == platform_key and key[1] == api_url and key[2] != access_token]
+        if not stale:
+            return
+        clients = [cls._instances.pop(key) for key in stale]
+        logger.info(f"访问令牌已更换，关闭 {len(clients)} 个旧的{platform_key}API客户端")
+        async_runner.submit(async_runner.safe_await(cls._close_clients(clients), "关闭旧API客户端"))
+    
+    @classmethod
+    async def _close_clients(cls, clients: List[BaseAPIClient]) -> None:
+        """
+        关闭客户端专属会话，以及不再被其他实例使用的共享会话
+        
+        Args:
+            clients: 要关闭的客户端列表
+        """
+        live_keys = {client._session_key for client in cls._instances.values()}
+        for client in clients:
+            await client.close()
+            if client._session_key not in live_keys:
+                await close_shared_session(client._session_key)
     
     @classmethod
     def get_supported_platforms(cls) -> list:
@@ -84,3 +171,51 @@ class APIClientFactory:
             是否支持该平台
         """
         return platform.lower() in cls._clients
+    
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """
+        关闭所有客户端共享的HTTP会话，并清空已创建的客户端实例
+        应在程序退出前于后台事件循环中调用
+        """
+        clients = list(cls._instances.values())
+        cls._instances.clear()
+        for client in clients:
+            await client.close()
+        await close_shared_sessions()
+    
+    @classmethod
+    async def gather_pr_details(cls, clients: Dict[str, BaseAPIClient], pr_requests: List[Dict[str, Any]],
+                                concurrency: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        跨平台、跨仓库一次性并发获取多个PR的详细信息
+        
+        Args:
+            clients: 平台名称到API客户端的映射
+            pr_requests: PR列表，每个元素包含 platform、owner、repo、pr_id
+            concurrency: 每个客户端的最大并发请求数，默认使用各客户端的 max_concurrency
+            
+        Returns:
+            与输入顺序一致的PR详细信息列表，出错或缺少对应平台客户端的项为None
+        """
+        # 按平台分组，记录每项在输入中的位置以便还原顺序
+        groups: Dict[str, List[int]] = {}
+        for index, req in enumerate(pr_requests):
+            groups.setdefault(req.get("platform", "gitee"), []).append(index)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pr_requests)
+        platforms = []
+        for platform in groups:
+            if platform in clients:
+                platforms.append(platform)
+            else:
+                logger.warning(f"平台 {platform} 的API客户端不存在，跳过 {len(groups[platform])} 个PR")
+        
+        group_results = await asyncio.gather(*[
+            clients[platform].get_multiple_pr_details([pr_requests[i] for i in groups[platform]], concurrency)
+            for platform in platforms
+        ])
+        for platform, details in zip(platforms, group_results):
+            for index, pr_data in zip(groups[platform], details):
+                results[index] = pr_data
+        return results
@@ -0,0 +1,122 @@
+"""
+后台事件循环模块，为同步代码提供统一的异步执行入口
+所有API请求都在同一个长期运行的事件循环中执行，从而可以复用HTTP会话与连接池
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Optional
+
+try:
+    import uvloop
+except ImportError:  # uvloop 为可选依赖，且不支持 Windows
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取后台事件循环，首次调用时启动后台线程
+
+    Returns:
+        后台事件循环
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="api-event-loop", daemon=True)
+            _thread.start()
+            logger.debug(f"后台事件循环已启动: {type(_loop).__module__}")
+        return _loop
+
+
+def in_background_loop() -> bool:
+    """
+    检查当前是否运行在后台事件循环中
+
+    Returns:
+        当前正在运行的事件循环是否为后台事件循环
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return running is _loop
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    在后台事件循环中执行协程并同步等待结果
+
+    Args:
+        coro: 要执行的协程
+        timeout: 等待超时时间（秒），None 表示一直等待
+
+    Returns:
+        协程的返回值
+    """
+    if in_background_loop():
+        raise RuntimeError("不能在后台事件循环中同步等待协程，请直接使用 await")
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    return future.result(timeout)
+
+
+def submit(coro: Awaitable[Any]) -> "concurrent.futures.Future":
+    """
+    将协程提交到后台事件循环执行，不等待结果
+
+    Args:
+        coro: 要执行的协程
+
+    Returns:
+        可在其他线程中等待的 concurrent.futures.Future
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+async def safe_await(coro: Awaitable[Any], description: str = "") -> Any:
+    """
+    等待协程完成，出错时记录日志并返回 None
+
+    用于 asyncio.gather 的批量任务，使单个任务的异常在任务内部转换为 None，无需再逐项检查结果
+
+    Args:
+        coro: 要等待的协程
+        description: 出错时日志中的任务描述
+
+    Returns:
+        协程的返回值，出错时为 None
+    """
+    try:
+        return await coro
+    except Exception as e:
+        logger.error(f"{description}时出错: {e}" if description else f"异步任务出错: {e}")
+        return None
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """
+    停止后台事件循环并等待线程退出
+
+    Args:
+        timeout: 等待线程退出的超时时间（秒）
+    """
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None:
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=timeout)
+    if not loop.is_running():
+        loop.close()
+    logger.debug("后台事件循环已停止")
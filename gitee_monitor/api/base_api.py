@@ -3,12 +3,116 @@
 支持多平台扩展（Gitee、GitHub等）
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Mapping, Optional, Set, Tuple, FrozenSet
+from urllib.parse import urlsplit
+import asyncio
 import logging
+from types import MappingProxyType
 import aiohttp
 
+try:
+    import httpx
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = True
+except ImportError:  # httpx[http2] 为可选依赖
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+from ..config import fastjson
+from . import async_runner
+from .disk_cache import DiskCache
+from .rate_limiter import MAX_RETRIES, AsyncRateLimiter, is_rate_limited, retry_delay
+from .response_cache import CacheEntry, CacheKey, ResponseCache
+
 logger = logging.getLogger(__name__)
 
+# 底层请求结果：(状态码, 响应头, 解析后的数据)
+RawResponse = Tuple[int, Mapping[str, str], Any]
+
+# 共享会话池，key 为 (host, 请求头)，仅在后台事件循环中使用
+_SESSIONS: Dict[Tuple[str, FrozenSet[Tuple[str, str]]], aiohttp.ClientSession] = {}
+# 共享会话共用的连接器，由 close_shared_sessions 统一关闭
+_CONNECTOR: Optional[aiohttp.TCPConnector] = None
+# 后台重新验证任务，保留引用以免任务被垃圾回收
+_BACKGROUND_TASKS: Set[asyncio.Task] = set()
+# HTTP/2 共享客户端池，结构同上；同一 host 的并发请求复用一条多路复用连接
+_HTTPX_CLIENTS: Dict[Tuple[str, FrozenSet[Tuple[str, str]]], "httpx.AsyncClient"] = {}
+
+
+def _json_loads(body: bytes) -> Any:
+    """解析响应体，空响应体（如 204 No Content）视为空字典"""
+    if not body:
+        return {}
+    return fastjson.loads(body)
+
+
+def _new_connector(limit: int = 100) -> aiohttp.TCPConnector:
+    """创建带连接池配置的连接器"""
+    return aiohttp.TCPConnector(limit=limit, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75)
+
+
+def _new_session(headers: Mapping[str, str], connector: Optional[aiohttp.TCPConnector] = None) -> aiohttp.ClientSession:
+    """
+    创建会话
+
+    Args:
+        headers: 会话请求头
+        connector: 共享连接器，为空时会话创建并独占自己的连接器
+    """
+    return aiohttp.ClientSession(headers=headers, connector=connector or _new_connector(),
+                                 connector_owner=connector is None,
+                                 timeout=aiohttp.ClientTimeout(total=30), json_serialize=fastjson.dumps_str)
+
+
+def _get_shared_connector() -> aiohttp.TCPConnector:
+    """获取（或创建）所有共享会话共用的连接器，各平台客户端共享连接池和 DNS 缓存"""
+    global _CONNECTOR
+    if _CONNECTOR is None or _CONNECTOR.closed:
+        _CONNECTOR = _new_connector(limit=200)
+    return _CONNECTOR
+
+
+def _new_httpx_client(headers: Mapping[str, str]) -> "httpx.AsyncClient":
+    """创建启用 HTTP/2 的 httpx 客户端"""
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=75)
+    return httpx.AsyncClient(http2=True, headers=headers, limits=limits, timeout=30.0)
+
+
+async def close_shared_sessions() -> None:
+    """关闭共享会话池中的所有会话，以及它们共用的连接器"""
+    global _CONNECTOR
+    sessions = list(_SESSIONS.values())
+    _SESSIONS.clear()
+    for session in sessions:
+        if not session.closed:
+            await session.close()
+    # 会话不持有共享连接器，需在所有会话关闭后单独关闭一次
+    if _CONNECTOR is not None:
+        await _CONNECTOR.close()
+        _CONNECTOR = None
+    clients = list(_HTTPX_CLIENTS.values())
+    _HTTPX_CLIENTS.clear()
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+    if sessions or clients:
+        logger.info(f"已关闭 {len(sessions) + len(clients)} 个共享HTTP会话")
+
+
+async def close_shared_session(key: Tuple[str, FrozenSet[Tuple[str, str]]]) -> None:
+    """
+    关闭单个共享会话（如更换令牌后旧请求头对应的会话），共用的连接器保持不变
+    
+    Args:
+        key: 共享会话池的 key，即 (host, 请求头)
+    """
+    session = _SESSIONS.pop(key, None)
+    if session is not None and not session.closed:
+        await session.close()
+    client = _HTTPX_CLIENTS.pop(key, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 class BaseAPIClient(ABC):
     """
@@ -16,17 +120,47 @@ class BaseAPIClient(ABC):
     定义标准的API接口，支持多平台扩展
     """
     
-    def __init__(self, api_url: str, access_token: str):
+    # 接口路径模板，子类按需定义；实例化时与 api_url 拼接为完整 URL 模板
+    URL_TEMPLATES: Dict[str, str] = {}
+    
+    # 长期运行的监控会持有多个客户端实例，使用 __slots__ 省去实例 __dict__；子类需声明 __slots__ = ()
+    __slots__ = ("api_url", "access_token", "headers", "http2", "max_concurrency", "_session_key", "_urls",
+                 "_cache", "_disk_cache", "_limiter", "_inflight", "_session")
+    
+    def __init__(self, api_url: str, access_token: str, cache_ttl: float = 30, cache_size: int = 4096, http2: bool = False,
+                 rate_limit: float = 10, disk_cache: Optional[DiskCache] = None, max_concurrency: int = 32,
+                 rate_limiter: Optional[AsyncRateLimiter] = None):
         """
         初始化API客户端
         
         Args:
             api_url: API基础URL
             access_token: 访问令牌
+            cache_ttl: GET 响应缓存时间（秒），0 表示不缓存
+            cache_size: GET 响应缓存的最大条目数
+            http2: 是否使用 httpx 的 HTTP/2 传输（需安装 httpx[http2]），否则使用 aiohttp
+            rate_limit: 每秒最多发送的请求数，会根据服务端返回的限流头自动下调
+            disk_cache: 磁盘缓存，内存缓存未命中时使用其中未超过 stale_ttl 的响应并在后台重新验证
+            max_concurrency: 批量获取时的默认最大并发数
+            rate_limiter: 共享的限流器（如同一主机的所有客户端共用），指定时忽略 rate_limit
         """
         self.api_url = api_url
         self.access_token = access_token
-        self.headers = self._build_headers()
+        self.max_concurrency = max_concurrency
+        # 请求头只读，可在会话之间直接共享
+        self.headers = MappingProxyType(self._build_headers())
+        self._session_key = (urlsplit(api_url).netloc, frozenset(self.headers.items()))
+        self._urls = {name: api_url + path for name, path in self.URL_TEMPLATES.items()}
+        self._cache = ResponseCache(ttl=cache_ttl, max_size=cache_size)
+        self._disk_cache = disk_cache if cache_ttl > 0 else None
+        self._limiter = rate_limiter if rate_limiter is not None else AsyncRateLimiter(rate=rate_limit)
+        # 进行中的 GET 请求，key 为 (事件循环, 缓存键)
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, CacheKey], asyncio.Future] = {}
+        # 通过 async with 使用客户端时创建的专属会话
+        self._session = None
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not self.http2:
+            logger.warning("未安装 httpx[http2]，回退到 aiohttp 传输")
     
     @abstractmethod
     def _build_headers(self) -> Dict[str, str]:
@@ -97,6 +231,22 @@ class BaseAPIClient(ABC):
         """
         return self.__class__.__name__.lower().replace('apiclient', '')
     
+    async def warm_up(self) -> None:
+        """
+        预热连接：解析域名并建立一条保持连接（keep-alive），使首个实际请求无需等待 DNS 解析和 TLS 握手
+        
+        应在后台事件循环中调用，建立的连接留在共享连接池中供后续请求复用；预热失败不影响正常请求
+        """
+        try:
+            if self.http2:
+                await self._get_shared_httpx_client().head(self.api_url)
+            else:
+                async with self._get_shared_session().head(self.api_url, allow_redirects=False):
+                    pass
+            logger.debug(f"已预热到 {self.api_url} 的连接")
+        except Exception as e:
+            logger.debug(f"预热到 {self.api_url} 的连接失败: {e}")
+    
     def validate_config(self) -> bool:
         """
         验证配置是否有效
@@ -105,28 +255,301 @@ class BaseAPIClient(ABC):
             配置是否有效
         """
         return bool(self.api_url and self.access_token)
+    
+    def invalidate_cache(self, owner: str, repo: str, pr_id: Optional[int] = None) -> None:
+        """
+        使指定仓库或PR相关的响应缓存失效，下次请求时以条件请求重新验证
+        
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            pr_id: PR ID，为空时使整个仓库的缓存失效
+        """
+        repo_url = f"{self.api_url}/repos/{owner}/{repo}"
+        if pr_id is None:
+            prefixes = (repo_url,)
+        else:
+            prefixes = (f"{repo_url}/pulls/{pr_id}", f"{repo_url}/issues/{pr_id}", f"{repo_url}/pulls")
+        count = self._cache.invalidate_urls(prefixes)
+        if self._disk_cache is not None:
+            self._disk_cache.invalidate_urls(prefixes)
+        if count:
+            logger.debug(f"已使 {owner}/{repo}#{pr_id} 的 {count} 个响应缓存失效")
+    
+    async def get_multiple_pr_details(self, pr_requests: List[Dict[str, Any]], concurrency: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        并发获取多个PR的详细信息
+        
+        Args:
+            pr_requests: PR列表，每个元素包含 owner、repo、pr_id
+            concurrency: 最大并发请求数，默认为 max_concurrency
+            
+        Returns:
+            与输入顺序一致的PR详细信息列表，出错的项为None
+        """
+        sem = asyncio.Semaphore(concurrency or self.max_concurrency)
+        
+        async def fetch(req: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with sem:
+                return await async_runner.safe_await(
+                    self.get_pr_details(req["owner"], req["repo"], req["pr_id"]),
+                    f"获取 PR {req['owner']}/{req['repo']}#{req['pr_id']} 详情"
+                )
+        
+        return await asyncio.gather(*[fetch(req) for req in pr_requests])
+    
+    async def _iter_pages(self, url: str, params: Mapping[str, Any], per_page: int = 100,
+                          window: int = 3, max_pages: Optional[int] = 10,
+                          items_key: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        分页获取列表接口的数据，每次并发请求 window 页并按页码顺序逐页产出
+        
+        遇到不满 per_page 的页、空页或请求失败时停止；提前停止或调用方中断迭代时取消未完成的请求
+        
+        Args:
+            url: 列表接口 URL
+            params: 除分页参数外的查询参数
+            per_page: 每页数量
+            window: 每批并发请求的页数
+            max_pages: 最多获取的页数，None 表示不限制
+            items_key: 响应为对象时列表所在的字段（如搜索接口的 "items"），为 None 时响应本身即列表
+            
+        Yields:
+            每页的数据列表
+        """
+        page = 1
+        while max_pages is None or page <= max_pages:
+            last = page + window if max_pages is None else min(page + window, max_pages + 1)
+            tasks = [
+                asyncio.ensure_future(self._make_request("GET", url, params={**params, "page": p, "per_page": per_page}))
+                for p in range(page, last)
+            ]
+            try:
+                for task in tasks:
+                    items = await task
+                    if items and items_key is not None:
+                        items = items.get(items_key)
+                    if not items:
+                        return
+                    yield items
+                    if len(items) < per_page:
+                        return
+            finally:
+                for task in tasks:
+                    task.cancel()
+            page = last
 
-    async def __aenter__(self):
-        self._session = aiohttp.ClientSession(headers=self.headers, timeout=aiohttp.ClientTimeout(total=30))
+    async def __aenter__(self) -> "BaseAPIClient":
+        # 后台事件循环中直接复用共享会话，无需为上下文单独创建
+        if not async_runner.in_background_loop():
+            self._session = _new_httpx_client(self.headers) if self.http2 else _new_session(self.headers)
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if getattr(self, "_session", None):
-            await self._session.close()
+    async def __aexit__(self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        关闭客户端专属的会话
+        共享会话池由 APIClientFactory.aclose_all 统一关闭
+        """
+        session = self._session
+        if session:
             self._session = None
+            if self.http2:
+                await session.aclose()
+            else:
+                await session.close()
+
+    def _get_shared_session(self) -> aiohttp.ClientSession:
+        """获取（或创建）与当前客户端 host 和请求头匹配的共享会话"""
+        session = _SESSIONS.get(self._session_key)
+        if session is None or session.closed:
+            session = _new_session(self.headers, _get_shared_connector())
+            _SESSIONS[self._session_key] = session
+        return session
+
+    def _get_shared_httpx_client(self) -> "httpx.AsyncClient":
+        """获取（或创建）与当前客户端 host 和请求头匹配的共享 HTTP/2 客户端"""
+        client = _HTTPX_CLIENTS.get(self._session_key)
+        if client is None or client.is_closed:
+            client = _new_httpx_client(self.headers)
+            _HTTPX_CLIENTS[self._session_key] = client
+        return client
+
+    async def _make_request(self, method: str, url: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        if method != "GET":
+            response = await self._send_request(method, url, **kwargs)
+            return response[2] if response else None
+
+        key = ResponseCache.make_key(url, kwargs.get("params"))
+        entry = self._cache.get_entry(key) if self._cache.ttl > 0 else None
+        if entry is not None and entry.fresh:
+            return entry.payload
+
+        # 相同的 GET 请求正在进行时直接等待其结果，避免重复请求
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, key)
+        future = self._inflight.get(inflight_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._inflight[inflight_key] = future
+        try:
+            result = None
+            if entry is None and self._disk_cache is not None:
+                result = await self._from_disk(url, key, **kwargs)
+            if result is None:
+                result = await self._fetch_get(url, key, entry, **kwargs)
+        except asyncio.CancelledError:
+            # 发起者被取消时，等待者按请求失败处理
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 标记异常已被获取，避免没有等待者时输出警告
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[inflight_key]
 
-    async def _make_request(self, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
-        session = getattr(self, "_session", None)
+    async def _from_disk(self, url: str, key: CacheKey, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """
+        从磁盘缓存读取响应（stale-while-revalidate）
+        
+        命中时将条目载入内存缓存并立即返回，同时在后台发起条件请求重新验证
+        
+        Returns:
+            缓存的响应数据，未命中时返回 None
+        """
+        disk_entry = await asyncio.to_thread(self._disk_cache.get, key)
+        if disk_entry is None:
+            return None
+        self._cache.set(key, disk_entry.payload, disk_entry.etag, disk_entry.last_modified)
+        stale = CacheEntry(0, disk_entry.payload, disk_entry.etag, disk_entry.last_modified)
+        task = asyncio.ensure_future(async_runner.safe_await(self._fetch_get(url, key, stale, **kwargs), f"重新验证 {url}"))
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+        return disk_entry.payload
+
+    async def _fetch_get(self, url: str, key: CacheKey, entry: Optional[CacheEntry], **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """
+        发送 GET 请求并更新响应缓存
+        
+        Args:
+            url: 请求 URL
+            key: 缓存键
+            entry: 已过期的缓存条目，用于发起条件请求
+            
+        Returns:
+            解析后的响应数据，请求失败时返回 None
+        """
+        if entry is not None:
+            # 缓存过期时携带校验信息发起条件请求，未修改时服务端返回 304 且不带响应体
+            conditional = entry.conditional_headers()
+            if conditional:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **conditional}
+
+        response = await self._send_request("GET", url, **kwargs)
+        if response is None:
+            return None
+        status, headers, payload = response
+        if status == 304:
+            if self._disk_cache is not None:
+                await asyncio.to_thread(self._disk_cache.touch, key)
+            return self._cache.refresh(key)
+        if payload is not None and self._cache.ttl > 0:
+            etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+            self._cache.set(key, payload, etag, last_modified)
+            if self._disk_cache is not None:
+                await asyncio.to_thread(self._disk_cache.set, key, payload, etag, last_modified)
+        return payload
+
+    async def _send_request(self, method: str, url: str, **kwargs: Any) -> Optional[RawResponse]:
+        """
+        经限流器发送请求，被限流（429 或配额耗尽的 403）时退避重试
+        
+        Returns:
+            同 _request_with_session；重试次数用尽时返回 None
+        """
+        limiter = self._limiter_for(url)
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire()
+            response = await self._send_once(method, url, **kwargs)
+            if response is None:
+                return None
+            status, headers, _ = response
+            limiter.update_from_headers(headers)
+            if not is_rate_limited(status, headers):
+                return response
+            if attempt < MAX_RETRIES:
+                delay = retry_delay(headers, attempt)
+                logger.warning(f"触发API限流 ({status})，{delay:.1f} 秒后重试: {method} {url}")
+                # 暂停整个限流器，避免其他并发请求继续撞上限流
+                limiter.pause(delay)
+        logger.error(f"Request failed: {method} {url} - 重试 {MAX_RETRIES} 次后仍被限流")
+        return None
+
+    def _limiter_for(self, url: str) -> AsyncRateLimiter:
+        """
+        返回请求 url 使用的限流器，配额单独计算的接口可在子类中覆盖
+        
+        Args:
+            url: 请求的完整URL
+            
+        Returns:
+            限流器，默认为客户端共享的限流器
+        """
+        return self._limiter
+
+    async def _send_once(self, method: str, url: str, **kwargs: Any) -> Optional[RawResponse]:
+        if self.http2:
+            return await self._send_httpx_request(method, url, **kwargs)
+        session = self._session
         if session is None:
-            async with aiohttp.ClientSession(headers=self.headers, timeout=aiohttp.ClientTimeout(total=30)) as temp_session:
+            if async_runner.in_background_loop():
+                return await self._request_with_session(self._get_shared_session(), method, url, **kwargs)
+            async with _new_session(self.headers) as temp_session:
                 return await self._request_with_session(temp_session, method, url, **kwargs)
         return await self._request_with_session(session, method, url, **kwargs)
 
-    async def _request_with_session(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+    async def _request_with_session(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any) -> Optional[RawResponse]:
+        """
+        发送请求并解析响应
+
+        Returns:
+            (状态码, 响应头, 解析后的数据) 元组，304 和限流响应不读取响应体，数据为 None；请求失败时返回 None
+        """
         try:
             async with session.request(method, url, **kwargs) as resp:
+                if resp.status == 304 or is_rate_limited(resp.status, resp.headers):
+                    return resp.status, resp.headers, None
                 resp.raise_for_status()
-                return await resp.json()
-        except aiohttp.ClientError as e:
+                return resp.status, resp.headers, _json_loads(await resp.read())
+        except (aiohttp.ClientError, ValueError) as e:
+            logger.error(f"Request failed: {method} {url} - {e}")
+            return None
+
+    async def _send_httpx_request(self, method: str, url: str, **kwargs: Any) -> Optional[RawResponse]:
+        client = self._session
+        if client is None:
+            if async_runner.in_background_loop():
+                return await self._request_with_httpx(self._get_shared_httpx_client(), method, url, **kwargs)
+            async with _new_httpx_client(self.headers) as temp_client:
+                return await self._request_with_httpx(temp_client, method, url, **kwargs)
+        return await self._request_with_httpx(client, method, url, **kwargs)
+
+    async def _request_with_httpx(self, client: "httpx.AsyncClient", method: str, url: str, **kwargs: Any) -> Optional[RawResponse]:
+        """使用 httpx 发送请求，返回值同 _request_with_session"""
+        try:
+            resp = await client.request(method, url, **kwargs)
+            if resp.status_code == 304 or is_rate_limited(resp.status_code, resp.headers):
+                return resp.status_code, resp.headers, None
+            resp.raise_for_status()
+            return resp.status_code, resp.headers, _json_loads(resp.content)
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Request failed: {method} {url} - {e}")
             return None
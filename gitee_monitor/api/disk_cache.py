@@ -0,0 +1,163 @@
+"""
+磁盘响应缓存模块，基于 sqlite 持久化 GET 响应，使服务重启后无需重新请求所有PR
+"""
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Iterable, NamedTuple, Optional
+from urllib.parse import urlencode
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖，未安装时使用 zlib 压缩
+    zstandard = None
+
+from ..config import fastjson
+from .response_cache import CacheKey
+
+logger = logging.getLogger(__name__)
+
+
+class DiskEntry(NamedTuple):
+    """磁盘缓存条目"""
+    payload: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class DiskCache:
+    """
+    sqlite 磁盘缓存，支持 stale-while-revalidate：
+    stale_ttl 内的条目可以直接返回，同时由调用方在后台重新验证
+    """
+
+    def __init__(self, path: str, stale_ttl: float = 86400):
+        """
+        初始化磁盘缓存
+
+        Args:
+            path: sqlite 数据库文件路径
+            stale_ttl: 条目可被直接使用的最长时间（秒），超过后视为不存在
+        """
+        self.path = path
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, codec TEXT, body BLOB, ts REAL)"
+        )
+        self._conn.commit()
+        self._codec = "zstd" if zstandard is not None else "zlib"
+
+    @staticmethod
+    def _key(key: CacheKey) -> str:
+        url, params = key
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def _encode(self, payload: Any) -> bytes:
+        data = fastjson.dumps(payload)
+        if self._codec == "zstd":
+            # zstd 压缩器实例不是线程安全的，每次单独创建
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data)
+
+    def _decode(self, codec: str, body: bytes) -> Any:
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("缓存条目使用 zstd 压缩，但未安装 zstandard")
+            data = zstandard.ZstdDecompressor().decompress(body)
+        else:
+            data = zlib.decompress(body)
+        return fastjson.loads(data)
+
+    def get(self, key: CacheKey) -> Optional[DiskEntry]:
+        """
+        读取未超过 stale_ttl 的缓存条目
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存条目，不存在、已超过 stale_ttl 或无法解析时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, codec, body, ts FROM responses WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        if row is None or time.time() - row[4] > self.stale_ttl:
+            return None
+        try:
+            payload = self._decode(row[2], row[3])
+        except (ValueError, zlib.error) as e:
+            logger.warning(f"磁盘缓存条目解析失败，已忽略: {e}")
+            return None
+        return DiskEntry(payload, row[0], row[1], row[4])
+
+    def set(self, key: CacheKey, payload: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """
+        写入缓存条目
+
+        Args:
+            key: 缓存键
+            payload: 解析后的响应数据
+            etag: 响应的 ETag 头
+            last_modified: 响应的 Last-Modified 头
+        """
+        body = self._encode(payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, codec, body, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._key(key), etag, last_modified, self._codec, body, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, key: CacheKey) -> None:
+        """
+        更新条目的存储时间（用于 304 Not Modified 响应）
+
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            self._conn.execute("UPDATE responses SET ts = ? WHERE key = ?", (time.time(), self._key(key)))
+            self._conn.commit()
+
+    def invalidate_urls(self, prefixes: Iterable[str]) -> None:
+        """
+        删除指定 URL（及其子路径、不同查询参数）的缓存条目
+
+        Args:
+            prefixes: URL 前缀列表
+        """
+        with self._lock:
+            for prefix in prefixes:
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? OR key LIKE ? ESCAPE '\\' OR key LIKE ? ESCAPE '\\'",
+                    (prefix, escaped + "/%", escaped + "?%")
+                )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        删除超过 stale_ttl 的条目
+
+        Returns:
+            删除的条目数
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE ts < ?", (time.time() - self.stale_ttl,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
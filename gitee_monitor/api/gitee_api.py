@@ -2,8 +2,8 @@
 Gitee API 客户端模块，处理与 Gitee API 的所有交互
 """
 import logging
-from typing import List, Dict, Any, Optional
-import aiohttp
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, Optional
 
 from .base_api import BaseAPIClient
 from .api_client_factory import APIClientFactory
@@ -12,6 +12,18 @@ logger = logging.getLogger(__name__)
 
 class GiteeAPIClient(BaseAPIClient):
     """Gitee API 客户端，处理与 Gitee API 的所有交互"""
+
+    __slots__ = ()
+
+    URL_TEMPLATES = {
+        "pr": "/repos/{owner}/{repo}/pulls/{pr_id}",
+        "pr_labels": "/repos/{owner}/{repo}/pulls/{pr_id}/labels",
+        "pr_label": "/repos/{owner}/{repo}/pulls/{pr_id}/labels/{label}",
+        "pulls": "/repos/{owner}/{repo}/pulls",
+    }
+
+    # 作者PR列表的固定查询参数（只读，每次请求直接复用）
+    _AUTHOR_PRS_PARAMS = MappingProxyType({"state": "all", "sort": "updated", "direction": "desc"})
     
     def _build_headers(self) -> Dict[str, str]:
         """
@@ -24,45 +36,63 @@ class GiteeAPIClient(BaseAPIClient):
         
 
     async def get_pr_labels(self, owner: str, repo: str, pr_id: int) -> Optional[List[Dict[str, Any]]]:
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_id}/labels"
+        url = self._urls["pr_labels"].format(owner=owner, repo=repo, pr_id=pr_id)
         result = await self._make_request("GET", url)
-        if result is not None:
+        if result is not None and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"异步获取 PR #{pr_id} 标签成功: {[l.get('name','') for l in result]}")
         return result
 
     async def get_pr_details(self, owner: str, repo: str, pr_id: int) -> Optional[Dict[str, Any]]:
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_id}"
+        url = self._urls["pr"].format(owner=owner, repo=repo, pr_id=pr_id)
         result = await self._make_request("GET", url)
-        if result is not None:
+        if result is not None and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"异步获取 PR #{pr_id} 详情成功: {result.get('title','')}")
         return result
 
     async def get_author_prs(self, owner: str, repo: str, author: str) -> Optional[List[Dict[str, Any]]]:
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls"
-        params = {
-            "state": "all",
-            "sort": "updated",
-            "direction": "desc",
-            "per_page": 100
-        }
-        result = await self._make_request("GET", url, params=params)
+        url = self._urls["pulls"].format(owner=owner, repo=repo)
+        result = await self._make_request("GET", url, params={**self._AUTHOR_PRS_PARAMS, "per_page": 100})
         if result is not None:
             author_prs = [pr for pr in result if pr.get('user', {}).get('login') == author]
-            logger.debug(f"异步获取作者 {author} 的PR成功: {len(author_prs)} 个PR")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"异步获取作者 {author} 的PR成功: {len(author_prs)} 个PR")
             return author_prs
         return None
 
+    async def iter_author_prs(self, owner: str, repo: str, author: str, per_page: int = 100,
+                              max_pages: Optional[int] = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐页获取作者在仓库中的PR（按更新时间倒序），边获取边产出
+        
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            author: PR创建者用户名
+            per_page: 每页数量
+            max_pages: 最多获取的页数，None 表示不限制
+            
+        Yields:
+            属于该作者的PR数据
+        """
+        url = self._urls["pulls"].format(owner=owner, repo=repo)
+        async for items in self._iter_pages(url, self._AUTHOR_PRS_PARAMS, per_page=per_page, max_pages=max_pages):
+            for pr in items:
+                if pr.get('user', {}).get('login') == author:
+                    yield pr
+
     async def add_pr_labels(self, owner: str, repo: str, pr_id: int, labels: List[str]) -> Optional[List[Dict[str, Any]]]:
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_id}/labels"
+        url = self._urls["pr_labels"].format(owner=owner, repo=repo, pr_id=pr_id)
         data = {"labels": labels}
         result = await self._make_request("POST", url, json=data)
+        self.invalidate_cache(owner, repo, pr_id)
         if result is not None:
             logger.info(f"异步为 PR #{pr_id} 添加标签成功: {labels}")
         return result
 
     async def remove_pr_label(self, owner: str, repo: str, pr_id: int, label: str) -> bool:
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_id}/labels/{label}"
+        url = self._urls["pr_label"].format(owner=owner, repo=repo, pr_id=pr_id, label=label)
         result = await self._make_request("DELETE", url)
+        self.invalidate_cache(owner, repo, pr_id)
         success = result is not None
         if success:
             logger.info(f"异步移除 PR #{pr_id} 标签成功: {label}")
@@ -2,16 +2,33 @@
 GitHub API 客户端模块，处理与 GitHub API 的所有交互
 """
 import logging
-from typing import List, Dict, Any, Optional
-import aiohttp
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, Optional
 
 from .base_api import BaseAPIClient
 from .api_client_factory import APIClientFactory
+from .rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
+# 搜索接口单独计算配额（认证用户每分钟 30 次），其限流头不能影响同一主机上其他接口共用的限流器
+SEARCH_RATE_LIMIT = 0.5
+_search_limiters: Dict[str, AsyncRateLimiter] = {}
+
 class GitHubAPIClient(BaseAPIClient):
     """GitHub API 客户端，处理与 GitHub API 的所有交互"""
+
+    __slots__ = ()
+
+    URL_TEMPLATES = {
+        "pr": "/repos/{owner}/{repo}/pulls/{pr_id}",
+        "pr_labels": "/repos/{owner}/{repo}/issues/{pr_id}/labels",
+        "pulls": "/repos/{owner}/{repo}/pulls",
+        "search_issues": "/search/issues",
+    }
+
+    # 按作者搜索PR的固定查询参数（只读，每次请求直接复用）
+    _SEARCH_PARAMS = MappingProxyType({"sort": "created", "order": "desc"})
     
     def _build_headers(self) -> Dict[str, str]:
         """
@@ -27,7 +44,43 @@ class GitHubAPIClient(BaseAPIClient):
         if self.access_token:
             headers["Authorization"] = f"token {self.access_token}"
         return headers
+
+    @staticmethod
+    def _author_query(owner: str, repo: str, author: str, state: str) -> str:
+        """
+        构造按作者搜索PR的查询语句，由服务端完成作者和状态过滤
+        
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            author: PR创建者用户名，为空时不按作者过滤
+            state: PR状态，可选值为 open, closed, all
+            
+        Returns:
+            搜索接口的 q 参数
+        """
+        query = f"is:pr repo:{owner}/{repo}"
+        if author:
+            query = f"{query} author:{author}"
+        return query if state == "all" else f"{query} is:{state}"
         
+    def _limiter_for(self, url: str) -> AsyncRateLimiter:
+        """
+        搜索接口使用按 API 地址区分的独立限流器，其余接口使用共享限流器
+        
+        Args:
+            url: 请求的完整URL
+            
+        Returns:
+            限流器
+        """
+        if url != self._urls["search_issues"]:
+            return self._limiter
+        limiter = _search_limiters.get(self.api_url)
+        if limiter is None:
+            limiter = _search_limiters.setdefault(self.api_url, AsyncRateLimiter(rate=SEARCH_RATE_LIMIT, capacity=5))
+        return limiter
+
     async def get_pr_labels(self, owner: str, repo: str, pr_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         获取指定 PR 的标签列表
@@ -40,9 +93,9 @@ class GitHubAPIClient(BaseAPIClient):
         Returns:
             标签列表，出错时返回 None
         """
-        url = f"{self.api_url}/repos/{owner}/{repo}/issues/{pr_id}/labels"
+        url = self._urls["pr_labels"].format(owner=owner, repo=repo, pr_id=pr_id)
         result = await self._make_request("GET", url)
-        if result is not None:
+        if result is not None and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"获取 GitHub PR #{pr_id} 标签成功: {[label.get('name', '') for label in result]}")
         return result
     
@@ -58,9 +111,9 @@ class GitHubAPIClient(BaseAPIClient):
         Returns:
             PR 详细信息，出错时返回 None
         """
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_id}"
+        url = self._urls["pr"].format(owner=owner, repo=repo, pr_id=pr_id)
         result = await self._make_request("GET", url)
-        if result is not None:
+        if result is not None and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"获取 GitHub PR #{pr_id} 详情成功")
         return result
             
@@ -79,24 +132,42 @@ class GitHubAPIClient(BaseAPIClient):
         Returns:
             PR列表，出错时返回 None
         """
-        url = f"{self.api_url}/repos/{owner}/{repo}/pulls"
-        params = {
-            "state": state,
-            "sort": "created",
-            "direction": "desc",
-            "page": page,
-            "per_page": per_page
-        }
-        
+        url = self._urls["search_issues"]
+        params = {**self._SEARCH_PARAMS, "q": self._author_query(owner, repo, author, state),
+                  "page": page, "per_page": per_page}
+
         result = await self._make_request("GET", url, params=params)
         if result is not None:
-            if author:
-                result = [pr for pr in result if pr.get('user', {}).get('login') == author]
-            logger.debug(f"获取作者 {author} 在 {owner}/{repo} 的GitHub PR列表成功，共 {len(result)} 个")
+            # 搜索接口返回 {"total_count": ..., "items": [...]}，条目为 issue 格式
+            result = result.get("items", [])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"获取作者 {author} 在 {owner}/{repo} 的GitHub PR列表成功，共 {len(result)} 个")
             return result
         logger.error(f"获取作者 {author} 在 {owner}/{repo} 的GitHub PR列表失败")
         return None
 
+    async def iter_author_prs(self, owner: str, repo: str, author: str, state: str = "open",
+                              per_page: int = 100, max_pages: Optional[int] = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐页获取作者在仓库中的PR（按创建时间倒序），边获取边产出
+        
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            author: PR创建者用户名
+            state: PR状态，可选值为 open, closed, all，默认为 open
+            per_page: 每页数量
+            max_pages: 最多获取的页数，None 表示不限制
+            
+        Yields:
+            属于该作者的PR数据
+        """
+        params = {**self._SEARCH_PARAMS, "q": self._author_query(owner, repo, author, state)}
+        async for items in self._iter_pages(self._urls["search_issues"], params, per_page=per_page,
+                                            max_pages=max_pages, items_key="items"):
+            for pr in items:
+                yield pr
+
 
 # 注册GitHubAPIClient到工厂
 APIClientFactory.register_client("github", GitHubAPIClient)
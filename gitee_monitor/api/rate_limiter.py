@@ -0,0 +1,148 @@
+"""
+API 限流模块，基于令牌桶控制请求速率，并根据服务端返回的限流头动态调整
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Mapping, Optional
+
+# 被限流时的最大重试次数
+MAX_RETRIES = 3
+# 单次重试等待的上限（秒）
+MAX_RETRY_DELAY = 60.0
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """读取数值型响应头，不存在或格式错误时返回 None"""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def is_rate_limited(status: int, headers: Mapping[str, str]) -> bool:
+    """
+    判断响应是否表示触发了限流
+
+    Args:
+        status: HTTP 状态码
+        headers: 响应头
+
+    Returns:
+        429，或剩余配额为 0 的 403 时返回 True
+    """
+    if status == 429:
+        return True
+    return status == 403 and _header_float(headers, "X-RateLimit-Remaining") == 0
+
+
+def retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+    """
+    计算被限流后的重试等待时间
+
+    优先使用 Retry-After，其次使用 X-RateLimit-Reset，否则按指数退避，并叠加随机抖动
+
+    Args:
+        headers: 响应头
+        attempt: 已重试次数（从 0 开始）
+
+    Returns:
+        等待秒数
+    """
+    delay = _header_float(headers, "Retry-After")
+    if delay is None:
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        delay = reset - time.time() if reset is not None else 2 ** attempt
+    delay = max(0.0, delay) + random.uniform(0, 0.5 * 2 ** attempt)
+    return min(delay, MAX_RETRY_DELAY)
+
+
+class AsyncRateLimiter:
+    """
+    令牌桶限流器
+
+    内部状态由线程锁保护、且等待时不持有锁，因此可在多个事件循环之间共享
+    """
+
+    def __init__(self, rate: float = 10, capacity: Optional[float] = None, min_rate: float = 0.1):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发请求数），默认与 rate 相同
+            min_rate: 根据响应头降速时的最低速率
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """预留一个令牌，返回需要等待的秒数（令牌不足时记为欠账，按顺序排队）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    async def acquire(self) -> None:
+        """获取一个令牌，必要时异步等待"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def set_rate(self, rate: float) -> None:
+        """
+        修改基础速率
+        
+        Args:
+            rate: 每秒补充的令牌数
+        """
+        with self._lock:
+            self.base_rate = rate
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """
+        暂停发放令牌
+
+        Args:
+            seconds: 暂停秒数
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        根据 X-RateLimit-Remaining / X-RateLimit-Reset 调整速率
+
+        剩余配额在重置前不够按当前速率消耗时降速，配额耗尽时暂停到重置时间
+
+        Args:
+            headers: 响应头
+        """
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        window = reset - time.time() if reset is not None else None
+        if window is None or window <= 0:
+            return
+        if remaining <= 0:
+            self.pause(min(window, MAX_RETRY_DELAY))
+            return
+        with self._lock:
+            self.rate = max(self.min_rate, min(self.base_rate, remaining / window))
@@ -0,0 +1,143 @@
+"""
+API 响应缓存模块，缓存幂等 GET 请求的响应，避免在 TTL 内重复请求
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class CacheEntry(NamedTuple):
+    """缓存条目，保留校验信息以便过期后发起条件请求"""
+    expires: float
+    payload: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.monotonic()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """构造条件请求头（If-None-Match / If-Modified-Since）"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    GET 响应缓存，带 TTL 过期和 LRU 容量限制
+    过期条目不会立即删除，仍可凭 ETag / Last-Modified 发起条件请求
+    """
+
+    def __init__(self, ttl: float = 30, max_size: int = 4096):
+        """
+        初始化响应缓存
+
+        Args:
+            ttl: 缓存生存时间（秒）
+            max_size: 最大缓存条目数，超出时淘汰最久未使用的条目
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        """
+        根据 URL 和查询参数生成缓存键
+
+        Args:
+            url: 请求 URL
+            params: 查询参数
+
+        Returns:
+            缓存键
+        """
+        return (url, tuple(sorted(params.items())) if params else ())
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """获取未过期的缓存响应，未命中或已过期时返回 None"""
+        entry = self.get_entry(key)
+        if entry is None or not entry.fresh:
+            return None
+        return entry.payload
+
+    def get_entry(self, key: CacheKey) -> Optional[CacheEntry]:
+        """获取缓存条目（可能已过期），不存在时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, payload: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """
+        写入缓存响应
+
+        Args:
+            key: 缓存键
+            payload: 解析后的响应数据
+            etag: 响应的 ETag 头
+            last_modified: 响应的 Last-Modified 头
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(time.monotonic() + self.ttl, payload, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: CacheKey) -> Optional[Any]:
+        """
+        重新计算条目的过期时间（用于 304 Not Modified 响应）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            条目中的缓存数据，条目不存在时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries[key] = entry._replace(expires=time.monotonic() + self.ttl)
+            return entry.payload
+
+    def invalidate_urls(self, prefixes: Iterable[str]) -> int:
+        """
+        使指定 URL（及其子路径）的缓存过期
+
+        条目只标记为过期而不删除，保留 ETag / Last-Modified，下次请求时以条件请求重新验证，
+        数据未变化时服务端返回不带响应体的 304
+
+        Args:
+            prefixes: URL 前缀列表，匹配 URL 本身或以 "前缀/" 开头的 URL
+
+        Returns:
+            过期的条目数
+        """
+        prefixes = tuple(prefixes)
+        sub_prefixes = tuple(p + "/" for p in prefixes)
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if entry.expires > 0 and (key[0] in prefixes or key[0].startswith(sub_prefixes))]
+            for key in keys:
+                self._entries[key] = self._entries[key]._replace(expires=0)
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
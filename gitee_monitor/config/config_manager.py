@@ -2,10 +2,14 @@
 配置管理模块，处理应用配置的加载、存储和访问
 """
 import os
-import json
 import logging
-import copy
-from typing import Dict, Any, List
+import atexit
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterator, List, Mapping, Optional, Tuple
+
+from . import fastjson
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +32,16 @@ class Config:
         "PULL_REQUEST_LISTS": [],  # PR监控列表，每个元素包含OWNER、REPO、PULL_REQUEST_ID
         "FOLLOWED_AUTHORS": [],  # 关注的PR创建者列表，每个元素包含AUTHOR、REPO
         "CACHE_TTL": 300,  # 缓存生存时间（秒）
+        "API_CACHE_TTL": 30,  # API响应缓存生存时间（秒），过期后以 ETag 条件请求重新验证
+        "API_CACHE_SIZE": 4096,  # API响应缓存最大条目数
         "POLL_INTERVAL": 60,  # 轮询间隔（秒）
         "ENABLE_NOTIFICATIONS": False,  # 是否启用通知
         "MAX_WORKERS": 5,  # 最大并发线程数
         "RATE_LIMIT_PER_SECOND": 1.5,  # API调用速率限制（每秒调用次数）
         "ENABLE_PARALLEL_PROCESSING": True,  # 是否启用并行处理
+        "ENABLE_HTTP2": False,  # 是否使用 HTTP/2 访问API（需安装 httpx[http2]）
+        "DISK_CACHE_PATH": "",  # API响应磁盘缓存文件路径（sqlite），为空时不启用
+        "DISK_CACHE_STALE_TTL": 86400,  # 磁盘缓存条目可直接使用的最长时间（秒）
         "AUTOMATION_RULES": [],  # 自动化规则列表
         "AUTOMATION_CONFIG": {  # 自动化引擎配置
             "enabled": True,
@@ -43,6 +52,29 @@ class Config:
         }
     }
     
+    # 配置文件中缺少 AUTOMATION_CONFIG 时使用的默认值（只读，避免每次调用重新构造）
+    _DEFAULT_AUTOMATION_CONFIG = MappingProxyType(DEFAULT_CONFIG["AUTOMATION_CONFIG"])
+    
+    @classmethod
+    def _fresh_default(cls) -> Dict[str, Any]:
+        """
+        构造默认配置的独立副本
+        
+        默认配置最多两层嵌套（列表中的字典、字典），只重新创建这两层可变容器，
+        比 copy.deepcopy 的通用反射遍历快得多
+        
+        Returns:
+            可自由修改的默认配置字典
+        """
+        config = {}
+        for key, value in cls.DEFAULT_CONFIG.items():
+            if isinstance(value, list):
+                value = [dict(item) if isinstance(item, dict) else item for item in value]
+            elif isinstance(value, dict):
+                value = dict(value)
+            config[key] = value
+        return config
+    
     def __init__(self, config_file: str):
         """
         初始化配置管理器
@@ -51,35 +83,188 @@ class Config:
             config_file: 配置文件路径
         """
         self.config_file = config_file
-        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self.config = self._fresh_default()
+        # 监控PR / 关注作者的索引，键 -> 在列表中的位置，用于 O(1) 去重
+        self._pr_index: Dict[Tuple[str, str, str, int], int] = {}
+        self._author_index: Dict[Tuple[str, str, str], int] = {}
+        # 平台名称 -> 平台配置条目
+        self._platform_index: Dict[str, Dict[str, Any]] = {}
+        # self.config 中平台、监控PR、关注作者列表的引用，由 _rebuild_indexes 在列表对象被替换时重新绑定
+        self._platforms: List[Dict[str, Any]] = self.config["PLATFORM"]
+        self._prs: List[Dict[str, Any]] = self.config["PULL_REQUEST_LISTS"]
+        self._authors: List[Dict[str, Any]] = self.config["FOLLOWED_AUTHORS"]
+        # 列表的只读快照，列表变化时置空，下次读取时重建
+        self._pr_lists_snapshot: Optional[Tuple[Dict[str, Any], ...]] = None
+        self._followed_authors_snapshot: Optional[Tuple[Dict[str, Any], ...]] = None
+        # 延迟保存：短时间内的多次修改合并为一次写盘
+        self._dirty = False
+        self._batch_depth = 0
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.RLock()
+        # 最近一次加载或写入时配置文件的 (mtime_ns, size)，文件未变化时跳过重新解析
+        self._file_stat: Optional[Tuple[int, int]] = None
         self.load_config()
+        atexit.register(self.flush)
         
     def load_config(self) -> None:
         """从文件加载配置"""
-        if os.path.exists(self.config_file):
+        # 保存是延迟执行的，有未写入的修改时文件内容落后于内存：先写入，避免用旧内容覆盖内存中的修改
+        self.flush()
+        try:
+            # 直接打开文件，不存在时由异常判断，省去单独的 exists 检查
+            with open(self.config_file, 'rb') as f:
+                st = os.fstat(f.fileno())
+                file_stat = (st.st_mtime_ns, st.st_size)
+                # 文件自上次加载/写入后未变化时无需重新解析
+                if file_stat == self._file_stat:
+                    logger.debug(f"配置文件 {self.config_file} 未变化，跳过重新加载")
+                    return
+                data = f.read()
+        except FileNotFoundError:
+            logger.warning(f"配置文件 {self.config_file} 不存在，使用默认配置")
+            self.save_config()  # 创建默认配置文件
+        except IOError as e:
+            logger.error(f"加载配置文件失败: {e}")
+        else:
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
+                loaded_config = fastjson.loads(data)
 
-                    for key in self.config:
-                        if key in loaded_config:
-                            self.config[key] = loaded_config[key]
+                # 只接受默认配置中存在的配置项
+                self.config.update({key: loaded_config[key]
+                                    for key in self.config.keys() & loaded_config.keys()})
+                self._file_stat = file_stat
                                 
                 logger.info(f"配置已从 {self.config_file} 加载")
-            except (json.JSONDecodeError, IOError) as e:
+            except fastjson.JSONDecodeError as e:
                 logger.error(f"加载配置文件失败: {e}")
-        else:
-            logger.warning(f"配置文件 {self.config_file} 不存在，使用默认配置")
-            self.save_config()  # 创建默认配置文件
+        self._normalize_platforms()
+        self._rebuild_indexes()
+
+    def _normalize_platforms(self) -> None:
+        """为旧配置中缺少 PLATFORM 字段的监控PR和关注作者补全默认平台（仅在加载时执行一次）"""
+        for key in ("PULL_REQUEST_LISTS", "FOLLOWED_AUTHORS"):
+            for item in self.config.get(key, []):
+                item["PLATFORM"] = (item.get("PLATFORM") or "gitee").lower()
+
+    @staticmethod
+    def _pr_key(pr: Dict[str, Any]) -> Tuple[str, str, str, int]:
+        """生成监控PR条目的索引键"""
+        return (pr["PLATFORM"], pr.get("OWNER"), pr.get("REPO"), pr.get("PULL_REQUEST_ID"))
+
+    @staticmethod
+    def _author_key(item: Dict[str, Any]) -> Tuple[str, str, str]:
+        """生成关注作者条目的索引键"""
+        return (item["PLATFORM"], item.get("AUTHOR"), item.get("REPO"))
+
+    def _rebuild_indexes(self) -> None:
+        """重新绑定列表引用，根据当前配置重建平台、监控PR和关注作者的索引，并使列表快照失效"""
+        self._platforms = self.config.setdefault("PLATFORM", [])
+        self._prs = self.config.setdefault("PULL_REQUEST_LISTS", [])
+        self._authors = self.config.setdefault("FOLLOWED_AUTHORS", [])
+        self._pr_lists_snapshot = None
+        self._followed_authors_snapshot = None
+        self._platform_index = {p.get("NAME"): p for p in self._platforms}
+        self._pr_index = {self._pr_key(pr): i for i, pr in enumerate(self._prs)}
+        self._author_index = {self._author_key(item): i for i, item in enumerate(self._authors)}
+
+    @staticmethod
+    def _swap_remove(items: List[Dict[str, Any]], index: Dict[Any, int], key: Any,
+                     key_func: Callable[[Dict[str, Any]], Any]) -> None:
+        """
+        以 O(1) 从列表中移除条目：用最后一个条目填补被移除的位置，并同步更新索引
+
+        Args:
+            items: 条目列表
+            index: 条目键到列表位置的索引
+            key: 要移除的条目的键
+            key_func: 由条目生成索引键的函数
+        """
+        idx = index.pop(key)
+        last = items.pop()
+        if idx < len(items):
+            items[idx] = last
+            index[key_func(last)] = idx
+
     def save_config(self) -> None:
-        """保存配置到文件"""
+        """保存配置到文件（先写临时文件再替换，避免写入中断导致配置文件损坏）"""
+        with self._save_lock:
+            self._dirty = False
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._write_config()
+
+    def _write_config(self) -> None:
+        """将当前配置写入文件"""
+        data = fastjson.dumps_pretty(self.config)
+        tmp_file = f"{self.config_file}.tmp"
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.config_file)
+            st = os.stat(self.config_file)
+            self._file_stat = (st.st_mtime_ns, st.st_size)
             logger.info(f"配置已保存到 {self.config_file}")
         except IOError as e:
             logger.error(f"保存配置文件失败: {e}")
     
+    def schedule_save(self, delay: float = 0.5) -> None:
+        """
+        延迟保存配置，delay 秒内的后续调用会重新计时，多次修改只写一次文件
+        
+        所有修改配置的方法都会自动调用，调用方无需在修改后手动保存
+        
+        Args:
+            delay: 延迟秒数
+        """
+        with self._save_lock:
+            self._dirty = True
+            if self._batch_depth:
+                return
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(delay, self._flush_from_timer)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self, force: bool = False) -> None:
+        """
+        立即写入尚未保存的修改
+        
+        Args:
+            force: 没有未保存的修改时也写入文件
+        """
+        with self._save_lock:
+            if self._dirty or force:
+                self.save_config()
+
+    def _flush_from_timer(self) -> None:
+        """延迟保存的定时回调，批量修改进行中时跳过，由 batch_update 退出时保存"""
+        with self._save_lock:
+            if not self._batch_depth:
+                self.flush()
+
+    @contextmanager
+    def batch_update(self) -> Iterator["Config"]:
+        """
+        批量修改配置，期间的修改不触发保存，退出时统一保存一次
+
+        用法::
+
+            with config.batch_update():
+                for author, repo in authors:
+                    config.add_followed_author(author, repo)
+        """
+        with self._save_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._save_lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         获取配置项
@@ -102,6 +287,10 @@ class Config:
             value: 配置项值
         """
         self.config[key] = value
+        if key in ("PULL_REQUEST_LISTS", "FOLLOWED_AUTHORS", "PLATFORM"):
+            self._normalize_platforms()
+            self._rebuild_indexes()
+        self.schedule_save()
         
     def update(self, config_dict: Dict[str, Any]) -> None:
         """
@@ -110,35 +299,35 @@ class Config:
         Args:
             config_dict: 包含多个配置项的字典
         """
-        for key, value in config_dict.items():
-            if key in self.config:
-                self.config[key] = value
+        keys = self.config.keys() & config_dict.keys()
+        self.config.update({key: config_dict[key] for key in keys})
+        if keys & {"PULL_REQUEST_LISTS", "FOLLOWED_AUTHORS", "PLATFORM"}:
+            self._normalize_platforms()
+            self._rebuild_indexes()
+        if keys:
+            self.schedule_save()
 
     def get_platforms(self) -> List[Dict[str, Any]]:
         """获取所有平台配置列表"""
-        return self.config.get("PLATFORM", [])
+        return self._platforms
 
     def get_platform_config(self, name: str) -> Dict[str, Any]:
         """根据名称获取单个平台配置"""
-        for p in self.get_platforms():
-            if p.get("NAME") == name:
-                return p
-        return {}
+        return self._platform_index.get(name, {})
 
     def set_platform_config(self, name: str, api_url: str = None, access_token: str = None) -> None:
         """设置或更新单个平台配置"""
-        platforms = self.get_platforms()
-        for p in platforms:
-            if p.get("NAME") == name:
-                if api_url is not None:
-                    p["API_URL"] = api_url
-                if access_token is not None:
-                    p["ACCESS_TOKEN"] = access_token
-                self.config["PLATFORM"] = platforms
-                return
-        new_entry = {"NAME": name, "API_URL": api_url or "", "ACCESS_TOKEN": access_token or ""}
-        platforms.append(new_entry)
-        self.config["PLATFORM"] = platforms
+        entry = self._platform_index.get(name)
+        if entry is not None:
+            if api_url is not None:
+                entry["API_URL"] = api_url
+            if access_token is not None:
+                entry["ACCESS_TOKEN"] = access_token
+        else:
+            entry = {"NAME": name, "API_URL": api_url or "", "ACCESS_TOKEN": access_token or ""}
+            self._platforms.append(entry)
+            self._platform_index[name] = entry
+        self.schedule_save()
 
     def get_access_token(self, name: str) -> str:
         """获取指定平台的访问令牌"""
@@ -148,7 +337,7 @@ class Config:
         """获取指定平台的API URL"""
         return self.get_platform_config(name).get("API_URL", "")
     
-    def add_pr(self, owner: str, repo: str, pr_id: int, platform: str = "gitee") -> None:
+    def add_pr(self, owner: str, repo: str, pr_id: int, platform: str = "gitee") -> bool:
         """
         添加 PR 到监控列表
         
@@ -157,29 +346,29 @@ class Config:
             repo: 仓库名称
             pr_id: PR ID
             platform: 平台名称（默认为gitee）
+            
+        Returns:
+            是否添加成功，PR 已存在时返回 False
         """
-        pr_lists = self.config.get("PULL_REQUEST_LISTS", [])
-        
-        # 检查是否已存在相同的PR
-        for existing_pr in pr_lists:
-            if (existing_pr.get("PLATFORM", "gitee") == platform and
-                existing_pr.get("OWNER") == owner and 
-                existing_pr.get("REPO") == repo and 
-                existing_pr.get("PULL_REQUEST_ID") == pr_id):
-                logger.warning(f"{platform.upper()} PR #{pr_id} ({owner}/{repo}) 已存在于监控列表中")
-                return
+        key = (platform, owner, repo, pr_id)
+        if key in self._pr_index:
+            logger.warning(f"{platform.upper()} PR #{pr_id} ({owner}/{repo}) 已存在于监控列表中")
+            return False
         
         # 添加新PR
-        pr_lists.append({
+        self._pr_index[key] = len(self._prs)
+        self._pr_lists_snapshot = None
+        self._prs.append({
             "PLATFORM": platform,
             "OWNER": owner,
             "REPO": repo,
             "PULL_REQUEST_ID": pr_id
         })
-        self.config["PULL_REQUEST_LISTS"] = pr_lists
         logger.info(f"添加 {platform.upper()} PR #{pr_id} ({owner}/{repo}) 到监控列表")
+        self.schedule_save()
+        return True
     
-    def remove_pr(self, owner: str, repo: str, pr_id: int, platform: str = "gitee") -> None:
+    def remove_pr(self, owner: str, repo: str, pr_id: int, platform: str = "gitee") -> bool:
         """
         从监控列表中移除 PR
         
@@ -188,32 +377,50 @@ class Config:
             repo: 仓库名称
             pr_id: PR ID
             platform: 平台名称（默认为gitee）
+            
+        Returns:
+            是否移除成功，PR 不存在时返回 False
         """
-        pr_lists = self.config.get("PULL_REQUEST_LISTS", [])
+        key = (platform, owner, repo, pr_id)
+        if key not in self._pr_index:
+            logger.warning(f"未找到要移除的 {platform.upper()} PR #{pr_id} ({owner}/{repo})")
+            return False
         
-        for i, existing_pr in enumerate(pr_lists):
-            if (existing_pr.get("PLATFORM", "gitee") == platform and
-                existing_pr.get("OWNER") == owner and 
-                existing_pr.get("REPO") == repo and 
-                existing_pr.get("PULL_REQUEST_ID") == pr_id):
-                pr_lists.pop(i)
-                self.config["PULL_REQUEST_LISTS"] = pr_lists
-                logger.info(f"从监控列表中移除 {platform.upper()} PR #{pr_id} ({owner}/{repo})")
-                return
+        self._swap_remove(self._prs, self._pr_index, key, self._pr_key)
+        self._pr_lists_snapshot = None
+        logger.info(f"从监控列表中移除 {platform.upper()} PR #{pr_id} ({owner}/{repo})")
+        self.schedule_save()
+        return True
+    
+    def has_pr(self, owner: str, repo: str, pr_id: int, platform: str = "gitee") -> bool:
+        """
+        检查 PR 是否已在监控列表中
         
-        logger.warning(f"未找到要移除的 {platform.upper()} PR #{pr_id} ({owner}/{repo})")
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            pr_id: PR ID
+            platform: 平台名称（默认为gitee）
+            
+        Returns:
+            是否已在监控列表中
+        """
+        return (platform, owner, repo, pr_id) in self._pr_index
     
-    def get_pr_lists(self) -> List[Dict[str, Any]]:
+    def get_pr_lists(self) -> Tuple[Dict[str, Any], ...]:
         """
         获取所有监控的 PR 列表
         
         Returns:
-            PR 列表，每个元素包含 OWNER、REPO、PULL_REQUEST_ID
+            PR 列表的只读快照，每个元素包含 PLATFORM、OWNER、REPO、PULL_REQUEST_ID；
+            列表未变化时重复调用返回同一对象
         """
-        return self.config.get("PULL_REQUEST_LISTS", [])
+        if self._pr_lists_snapshot is None:
+            self._pr_lists_snapshot = tuple(self._prs)
+        return self._pr_lists_snapshot
     
         
-    def add_followed_author(self, author: str, repo: str, platform: str = "gitee") -> None:
+    def add_followed_author(self, author: str, repo: str, platform: str = "gitee") -> bool:
         """
         添加关注的PR创建者
         
@@ -221,27 +428,28 @@ class Config:
             author: PR创建者用户名
             repo: 仓库名称，格式为 owner/repo
             platform: 平台名称，gitee 或 github
+            
+        Returns:
+            是否添加成功，已关注时返回 False
         """
-        followed_authors = self.config.get("FOLLOWED_AUTHORS", [])
-        
-        # 检查是否已存在相同的关注
-        for existing_author in followed_authors:
-            if (existing_author.get("AUTHOR") == author and 
-                existing_author.get("REPO") == repo and
-                existing_author.get("PLATFORM") == platform):
-                logger.warning(f"作者 {author} 的仓库 {repo} 在平台 {platform} 已存在于关注列表中")
-                return
+        key = (platform, author, repo)
+        if key in self._author_index:
+            logger.warning(f"作者 {author} 的仓库 {repo} 在平台 {platform} 已存在于关注列表中")
+            return False
         
         # 添加新关注
-        followed_authors.append({
+        self._author_index[key] = len(self._authors)
+        self._followed_authors_snapshot = None
+        self._authors.append({
             "AUTHOR": author,
             "REPO": repo,
             "PLATFORM": platform
         })
-        self.config["FOLLOWED_AUTHORS"] = followed_authors
         logger.info(f"添加作者 {author} 的仓库 {repo} 到关注列表 (平台: {platform})")
+        self.schedule_save()
+        return True
     
-    def remove_followed_author(self, author: str, repo: str, platform: str = "gitee") -> None:
+    def remove_followed_author(self, author: str, repo: str, platform: str = "gitee") -> bool:
         """
         从关注列表中移除PR创建者
         
@@ -249,28 +457,31 @@ class Config:
             author: PR创建者用户名
             repo: 仓库名称，格式为 owner/repo
             platform: 平台名称，gitee 或 github
+            
+        Returns:
+            是否移除成功，未关注时返回 False
         """
-        followed_authors = self.config.get("FOLLOWED_AUTHORS", [])
-        
-        for i, existing_author in enumerate(followed_authors):
-            if (existing_author.get("AUTHOR") == author and 
-                existing_author.get("REPO") == repo and
-                existing_author.get("PLATFORM") == platform):
-                followed_authors.pop(i)
-                self.config["FOLLOWED_AUTHORS"] = followed_authors
-                logger.info(f"从关注列表中移除作者 {author} 的仓库 {repo} (平台: {platform})")
-                return
+        key = (platform, author, repo)
+        if key not in self._author_index:
+            logger.warning(f"未找到要移除的作者 {author} 的仓库 {repo} (平台: {platform})")
+            return False
         
-        logger.warning(f"未找到要移除的作者 {author} 的仓库 {repo} (平台: {platform})")
+        self._swap_remove(self._authors, self._author_index, key, self._author_key)
+        self._followed_authors_snapshot = None
+        logger.info(f"从关注列表中移除作者 {author} 的仓库 {repo} (平台: {platform})")
+        self.schedule_save()
+        return True
     
-    def get_followed_authors(self) -> List[Dict[str, Any]]:
+    def get_followed_authors(self) -> Tuple[Dict[str, Any], ...]:
         """
         获取所有关注的PR创建者列表
         
         Returns:
-            关注列表，每个元素包含 AUTHOR、REPO、PLATFORM
+            关注列表的只读快照，每个元素包含 AUTHOR、REPO、PLATFORM；列表未变化时重复调用返回同一对象
         """
-        return self.config.get("FOLLOWED_AUTHORS", [])
+        if self._followed_authors_snapshot is None:
+            self._followed_authors_snapshot = tuple(self._authors)
+        return self._followed_authors_snapshot
     
     def get_automation_rules(self) -> List[Dict[str, Any]]:
         """
@@ -289,21 +500,16 @@ class Config:
             rules: 自动化规则列表
         """
         self.config["AUTOMATION_RULES"] = rules
+        self.schedule_save()
     
-    def get_automation_config(self) -> Dict[str, Any]:
+    def get_automation_config(self) -> Mapping[str, Any]:
         """
         获取自动化引擎配置
         
         Returns:
-            自动化引擎配置
+            自动化引擎配置（未配置时返回只读的默认配置，修改请使用 update_automation_config）
         """
-        return self.config.get("AUTOMATION_CONFIG", {
-            "enabled": True,
-            "max_parallel_executions": 5,
-            "default_cooldown": 300,
-            "max_executions_per_day": 100,
-            "log_level": "INFO"
-        })
+        return self.config.get("AUTOMATION_CONFIG") or self._DEFAULT_AUTOMATION_CONFIG
     
     def update_automation_config(self, automation_config: Dict[str, Any]) -> None:
         """
@@ -312,6 +518,9 @@ class Config:
         Args:
             automation_config: 自动化引擎配置
         """
-        current_config = self.get_automation_config()
+        current_config = self.config.get("AUTOMATION_CONFIG")
+        if not current_config:
+            # 尚未配置时以默认配置的副本为基础，之后直接原地更新
+            current_config = self.config["AUTOMATION_CONFIG"] = dict(self._DEFAULT_AUTOMATION_CONFIG)
         current_config.update(automation_config)
-        self.config["AUTOMATION_CONFIG"] = current_config
+        self.schedule_save()
@@ -0,0 +1,87 @@
+"""
+JSON 序列化模块，项目内所有 JSON 解析和序列化的统一入口
+
+安装了 orjson 时使用 orjson，否则回退到标准库 json
+"""
+import dataclasses
+import json
+from datetime import date, time
+from enum import Enum
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种实现抛出的解析错误都可用它捕获
+JSONDecodeError = json.JSONDecodeError
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+_PRETTY_OPTIONS = _DUMPS_OPTIONS | orjson.OPT_INDENT_2 if orjson is not None else 0
+
+
+def _default(obj: Any) -> Any:
+    """
+    标准库 json 的回退序列化：与 orjson 一致地支持 dataclass、datetime/date/time 和 Enum
+    dataclass 与 orjson 相同，跳过下划线开头的字段；嵌套对象由 json 再次调用本函数处理
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj) if not f.name.startswith("_")}
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    解析 JSON
+
+    Args:
+        data: JSON 文本（bytes 或 str）
+
+    Returns:
+        解析后的对象
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    序列化为紧凑的 UTF-8 编码 JSON，dataclass 实例直接序列化，无需先转换为字典
+
+    Args:
+        obj: 要序列化的对象
+
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """序列化为紧凑的 JSON 字符串"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """
+    序列化为带缩进的 UTF-8 编码 JSON，用于写入配置文件
+
+    Args:
+        obj: 要序列化的对象
+
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=_PRETTY_OPTIONS)
+    return json.dumps(obj, indent=4, ensure_ascii=False, default=_default).encode("utf-8")
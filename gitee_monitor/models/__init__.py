@@ -3,14 +3,23 @@ PR相关的数据模型定义
 使用dataclass提供结构化的数据管理
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import logging
+import sys
+
+from ..config import fastjson
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """驻留重复出现的字符串（平台、仓库名、用户名、标签名等），非字符串原样返回"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class PRLabel:
     """PR标签数据模型"""
     id: int
@@ -21,15 +30,16 @@ class PRLabel:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PRLabel':
         """从字典创建PRLabel实例"""
+        get = data.get
         return cls(
-            id=data.get('id', 0),
-            name=data.get('name', ''),
-            color=data.get('color', ''),
-            description=data.get('description')
+            id=get('id', 0),
+            name=_intern(get('name', '')),
+            color=get('color', ''),
+            description=get('description')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PRUser:
     """PR用户数据模型"""
     id: int
@@ -41,16 +51,17 @@ class PRUser:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PRUser':
         """从字典创建PRUser实例"""
+        get = data.get
         return cls(
-            id=data.get('id', 0),
-            login=data.get('login', ''),
-            name=data.get('name'),
-            avatar_url=data.get('avatar_url'),
-            html_url=data.get('html_url')
+            id=get('id', 0),
+            login=_intern(get('login', '')),
+            name=get('name'),
+            avatar_url=get('avatar_url'),
+            html_url=get('html_url')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PRRepository:
     """PR仓库数据模型"""
     id: int
@@ -63,18 +74,19 @@ class PRRepository:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PRRepository':
         """从字典创建PRRepository实例"""
-        owner_data = data.get('owner', {})
+        get = data.get
+        owner_data = get('owner', {})
         return cls(
-            id=data.get('id', 0),
-            name=data.get('name', ''),
-            full_name=data.get('full_name', ''),
+            id=get('id', 0),
+            name=_intern(get('name', '')),
+            full_name=_intern(get('full_name', '')),
             owner=PRUser.from_dict(owner_data),
-            html_url=data.get('html_url'),
-            description=data.get('description')
+            html_url=get('html_url'),
+            description=get('description')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PRBranch:
     """PR分支数据模型"""
     ref: str
@@ -84,15 +96,44 @@ class PRBranch:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PRBranch':
         """从字典创建PRBranch实例"""
-        repo_data = data.get('repo', {})
+        get = data.get
+        repo_data = get('repo', {})
         return cls(
-            ref=data.get('ref', ''),
-            sha=data.get('sha', ''),
+            ref=_intern(get('ref', '')),
+            sha=get('sha', ''),
             repo=PRRepository.from_dict(repo_data)
         )
 
 
-@dataclass
+def _user_to_dict(user: PRUser) -> Dict[str, Any]:
+    """将 PRUser 转换为字典"""
+    return {
+        'id': user.id,
+        'login': user.login,
+        'name': user.name,
+        'avatar_url': user.avatar_url,
+        'html_url': user.html_url
+    }
+
+
+def _branch_to_dict(branch: PRBranch) -> Dict[str, Any]:
+    """将 PRBranch（含仓库和仓库拥有者）转换为字典，嵌套对象只解引用一次"""
+    repo = branch.repo
+    return {
+        'ref': branch.ref,
+        'sha': branch.sha,
+        'repo': {
+            'id': repo.id,
+            'name': repo.name,
+            'full_name': repo.full_name,
+            'owner': _user_to_dict(repo.owner),
+            'html_url': repo.html_url,
+            'description': repo.description
+        }
+    }
+
+
+@dataclass(slots=True)
 class PullRequest:
     """PR数据模型"""
     id: int
@@ -110,9 +151,9 @@ class PullRequest:
     merged_at: Optional[str] = None
     labels: List[PRLabel] = field(default_factory=list)
     
-    # 新增字段用于缓存处理
-    owner: str = field(init=False)
-    repo: str = field(init=False)
+    # 新增字段用于缓存处理，由 __post_init__ 根据 base 分支填充
+    owner: str = field(default="", init=False)
+    repo: str = field(default="", init=False)
     platform: str = field(default="gitee")  # 添加平台信息
     
     def __post_init__(self):
@@ -121,8 +162,8 @@ class PullRequest:
         if self.base and self.base.repo:
             repo_parts = self.base.repo.full_name.split('/')
             if len(repo_parts) == 2:
-                self.owner = repo_parts[0]
-                self.repo = repo_parts[1]
+                self.owner = sys.intern(repo_parts[0])
+                self.repo = sys.intern(repo_parts[1])
             else:
                 self.owner = self.base.repo.owner.login
                 self.repo = self.base.repo.name
@@ -133,114 +174,115 @@ class PullRequest:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PullRequest':
         """从字典创建PullRequest实例"""
+        get = data.get
         # 处理用户信息
-        user_data = data.get('user', {})
+        user_data = get('user', {})
         user = PRUser.from_dict(user_data)
         
         # 处理分支信息
-        base_data = data.get('base', {})
-        head_data = data.get('head', {})
+        base_data = get('base', {})
+        head_data = get('head', {})
         base = PRBranch.from_dict(base_data) if base_data else None
         head = PRBranch.from_dict(head_data) if head_data else None
-          # 处理标签信息
-        labels_data = data.get('labels', [])
+        # 处理标签信息
+        labels_data = get('labels', [])
         labels = [PRLabel.from_dict(label) for label in labels_data]
         
         return cls(
-            id=data.get('id', 0),
-            number=data.get('number', 0),
-            title=data.get('title', ''),
-            body=data.get('body'),
-            state=data.get('state', 'open'),
+            id=get('id', 0),
+            number=get('number', 0),
+            title=get('title', ''),
+            body=get('body'),
+            state=_intern(get('state', 'open')),
             user=user,
             base=base,
             head=head,
-            html_url=data.get('html_url'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at'),
-            closed_at=data.get('closed_at'),
-            merged_at=data.get('merged_at'),
+            html_url=get('html_url'),
+            created_at=get('created_at'),
+            updated_at=get('updated_at'),
+            closed_at=get('closed_at'),
+            merged_at=get('merged_at'),
             labels=labels,
-            platform=data.get('platform', 'gitee')  # 添加平台信息处理
+            platform=_intern(get('platform', 'gitee'))  # 添加平台信息处理
         )
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
+        """
+        转换为字典格式（包含 owner、repo 字段），结构与 dataclasses.asdict 相同
+        
+        仅在需要字典的场景使用；序列化为 JSON 时使用 to_json，由 orjson 直接遍历 dataclass
+        """
         return {
             'id': self.id,
             'number': self.number,
             'title': self.title,
             'body': self.body,
             'state': self.state,
-            'user': {
-                'id': self.user.id,
-                'login': self.user.login,
-                'name': self.user.name,
-                'avatar_url': self.user.avatar_url,
-                'html_url': self.user.html_url
-            },
-            'base': {
-                'ref': self.base.ref,
-                'sha': self.base.sha,
-                'repo': {
-                    'id': self.base.repo.id,
-                    'name': self.base.repo.name,
-                    'full_name': self.base.repo.full_name,
-                    'html_url': self.base.repo.html_url,
-                    'description': self.base.repo.description,
-                    'owner': {
-                        'id': self.base.repo.owner.id,
-                        'login': self.base.repo.owner.login,
-                        'name': self.base.repo.owner.name,
-                        'avatar_url': self.base.repo.owner.avatar_url,
-                        'html_url': self.base.repo.owner.html_url
-                    }
-                }
-            } if self.base else None,
-            'head': {
-                'ref': self.head.ref,
-                'sha': self.head.sha,
-                'repo': {
-                    'id': self.head.repo.id,
-                    'name': self.head.repo.name,
-                    'full_name': self.head.repo.full_name,
-                    'html_url': self.head.repo.html_url,
-                    'description': self.head.repo.description,
-                    'owner': {
-                        'id': self.head.repo.owner.id,
-                        'login': self.head.repo.owner.login,
-                        'name': self.head.repo.owner.name,
-                        'avatar_url': self.head.repo.owner.avatar_url,
-                        'html_url': self.head.repo.owner.html_url
-                    }
-                }
-            } if self.head else None,            'html_url': self.html_url,
+            'user': _user_to_dict(self.user),
+            'base': _branch_to_dict(self.base) if self.base else None,
+            'head': _branch_to_dict(self.head) if self.head else None,
+            'html_url': self.html_url,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
             'closed_at': self.closed_at,
             'merged_at': self.merged_at,
-            'platform': self.platform,  # 添加平台信息
             'labels': [
-                {
-                    'id': label.id,
-                    'name': label.name,
-                    'color': label.color,
-                    'description': label.description
-                } for label in self.labels
-            ]
+                {'id': label.id, 'name': label.name, 'color': label.color, 'description': label.description}
+                for label in self.labels
+            ],
+            'owner': self.owner,
+            'repo': self.repo,
+            'platform': self.platform
         }
     
+    def to_json(self) -> bytes:
+        """序列化为 JSON（UTF-8 编码）"""
+        return fastjson.dumps(self)
+    
     def get_cache_key(self) -> str:
         """获取缓存键"""
         return f"{self.owner}/{self.repo}#{self.number}"
     
+    @staticmethod
+    def owner_repo_from_raw(data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        直接从API原始字典中提取 owner 和 repo，规则与 __post_init__ 一致，不构造任何嵌套对象
+        
+        Args:
+            data: API 返回的PR原始字典
+            
+        Returns:
+            (owner, repo) 元组
+        """
+        repo_data = (data.get('base') or {}).get('repo')
+        if repo_data is None:
+            return '', ''
+        repo_parts = repo_data.get('full_name', '').split('/')
+        if len(repo_parts) == 2:
+            return repo_parts[0], repo_parts[1]
+        return repo_data.get('owner', {}).get('login', ''), repo_data.get('name', '')
+    
+    @staticmethod
+    def cache_key_from_raw(data: Dict[str, Any]) -> str:
+        """
+        直接从API原始字典生成缓存键，结果与 PullRequest.from_dict(data).get_cache_key() 相同
+        
+        Args:
+            data: API 返回的PR原始字典
+            
+        Returns:
+            缓存键
+        """
+        owner, repo = PullRequest.owner_repo_from_raw(data)
+        return f"{owner}/{repo}#{data.get('number', 0)}"
+    
     def get_label_names(self) -> List[str]:
         """获取标签名称列表"""
         return [label.name for label in self.labels]
     
     def has_label(self, label_name: str) -> bool:
-        """检查是否包含指定标签"""
-        return label_name in self.get_label_names()
+        """检查是否包含指定标签，找到即返回，不构造标签名称列表"""
+        return any(label.name == label_name for label in self.labels)
     
     def is_open(self) -> bool:
         """检查PR是否为开放状态"""
@@ -249,3 +291,136 @@ class PullRequest:
     def is_closed(self) -> bool:
         """检查PR是否为关闭状态"""
         return self.state in ['closed', 'merged']
+
+
+class PullRequestLazy:
+    """
+    PR数据的只读惰性视图
+
+    保存原始字典，user、base、head、labels 等嵌套对象在首次访问时才构造，
+    轮询等只需要标签、编号等少数字段的场景无需解析整个PR；需要修改或完整数据时调用 materialize()
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        初始化惰性视图
+
+        Args:
+            data: API 返回的PR原始字典
+        """
+        self._data = data
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """原始PR字典"""
+        return self._data
+
+    @property
+    def id(self) -> int:
+        return self._data.get('id', 0)
+
+    @property
+    def number(self) -> int:
+        return self._data.get('number', 0)
+
+    @property
+    def title(self) -> str:
+        return self._data.get('title', '')
+
+    @property
+    def body(self) -> Optional[str]:
+        return self._data.get('body')
+
+    @property
+    def state(self) -> str:
+        return self._data.get('state', 'open')
+
+    @property
+    def html_url(self) -> Optional[str]:
+        return self._data.get('html_url')
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return self._data.get('created_at')
+
+    @property
+    def updated_at(self) -> Optional[str]:
+        return self._data.get('updated_at')
+
+    @property
+    def closed_at(self) -> Optional[str]:
+        return self._data.get('closed_at')
+
+    @property
+    def merged_at(self) -> Optional[str]:
+        return self._data.get('merged_at')
+
+    @property
+    def platform(self) -> str:
+        return self._data.get('platform', 'gitee')
+
+    @cached_property
+    def user(self) -> PRUser:
+        return PRUser.from_dict(self._data.get('user', {}))
+
+    @cached_property
+    def base(self) -> Optional[PRBranch]:
+        base_data = self._data.get('base', {})
+        return PRBranch.from_dict(base_data) if base_data else None
+
+    @cached_property
+    def head(self) -> Optional[PRBranch]:
+        head_data = self._data.get('head', {})
+        return PRBranch.from_dict(head_data) if head_data else None
+
+    @cached_property
+    def labels(self) -> List[PRLabel]:
+        return [PRLabel.from_dict(label) for label in self._data.get('labels', [])]
+
+    @cached_property
+    def _owner_repo(self) -> Tuple[str, str]:
+        return PullRequest.owner_repo_from_raw(self._data)
+
+    @property
+    def owner(self) -> str:
+        return self._owner_repo[0]
+
+    @property
+    def repo(self) -> str:
+        return self._owner_repo[1]
+
+    def materialize(self) -> PullRequest:
+        """构造完整的 PullRequest 对象"""
+        return PullRequest.from_dict(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式，与 PullRequest.to_dict 一致"""
+        return self.materialize().to_dict()
+
+    def to_json(self) -> bytes:
+        """序列化为 JSON（UTF-8 编码）"""
+        return self.materialize().to_json()
+
+    def get_cache_key(self) -> str:
+        """获取缓存键"""
+        return PullRequest.cache_key_from_raw(self._data)
+
+    def get_label_names(self) -> List[str]:
+        """获取标签名称列表，未访问过 labels 时直接读取原始字典"""
+        return [label.get('name', '') for label in self._data.get('labels', [])]
+
+    @cached_property
+    def _label_name_set(self) -> frozenset:
+        return frozenset(label.get('name', '') for label in self._data.get('labels', []))
+
+    def has_label(self, label_name: str) -> bool:
+        """检查是否包含指定标签，标签名称集合在首次调用时构造"""
+        return label_name in self._label_name_set
+
+    def is_open(self) -> bool:
+        """检查PR是否为开放状态"""
+        return self.state == 'open'
+
+    def is_closed(self) -> bool:
+        """检查PR是否为关闭状态"""
+        return self.state in ['closed', 'merged']
@@ -1,16 +1,20 @@
 """
 自动化规则相关的数据模型
 """
+import dataclasses
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime, time
 from enum import Enum
+from functools import lru_cache
 import logging
+import re
+import sys
 
 logger = logging.getLogger(__name__)
 
 
-class TriggerType(Enum):
+class TriggerType(str, Enum):
     """触发器类型枚举"""
     PR_ADDED = "pr_added"           # PR被添加到监控
     PR_UPDATED = "pr_updated"       # PR状态更新
@@ -20,7 +24,7 @@ class TriggerType(Enum):
     MANUAL = "manual"              # 手动触发
 
 
-class ConditionType(Enum):
+class ConditionType(str, Enum):
     """条件类型枚举"""
     HAS_LABEL = "has_label"         # 包含特定标签
     NOT_HAS_LABEL = "not_has_label" # 不包含特定标签
@@ -38,7 +42,7 @@ class ConditionType(Enum):
     IS_NOT_DRAFT = "is_not_draft"   # 不是草稿PR
 
 
-class ActionType(Enum):
+class ActionType(str, Enum):
     """动作类型枚举"""
     COMMENT = "comment"             # 添加评论
     ADD_LABEL = "add_label"         # 添加标签
@@ -51,7 +55,7 @@ class ActionType(Enum):
     LOG = "log"                     # 记录日志
 
 
-class OperatorType(Enum):
+class OperatorType(str, Enum):
     """操作符类型枚举"""
     EQUALS = "eq"                   # 等于
     NOT_EQUALS = "ne"               # 不等于
@@ -67,13 +71,49 @@ class OperatorType(Enum):
     LESS_EQUAL = "le"              # 小于等于
 
 
-@dataclass
+@lru_cache(maxsize=1024)
+def _parse_time(value: str) -> time:
+    """解析 HH:MM:SS 时间字符串，相同字符串只解析一次"""
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        # 兼容 fromisoformat 不接受的写法（如未补零的 9:00:00）
+        return datetime.strptime(value, '%H:%M:%S').time()
+
+
+@lru_cache(maxsize=4096)
+def _parse_dt(value: str) -> datetime:
+    """解析 ISO 格式时间字符串，相同字符串只解析一次（datetime 不可变，可安全共享）"""
+    return datetime.fromisoformat(value)
+
+
+# 各枚举的取值集合，用于 O(1) 校验规则中的类型字符串
+TRIGGER_VALUES = frozenset(t.value for t in TriggerType)
+CONDITION_VALUES = frozenset(c.value for c in ConditionType)
+ACTION_VALUES = frozenset(a.value for a in ActionType)
+OPERATOR_VALUES = frozenset(o.value for o in OperatorType)
+# 需要预编译正则的操作符
+_REGEX_OPERATORS = frozenset((OperatorType.MATCHES.value, OperatorType.NOT_MATCHES.value))
+
+
+@dataclass(slots=True)
 class Condition:
     """自动化条件"""
     type: str                       # 条件类型
     operator: str                   # 操作符
     value: Any                      # 比较值
     field: Optional[str] = None     # 字段名（用于复杂条件）
+    # 正则匹配类操作符预编译的模式，评估时直接使用；下划线开头，不参与序列化
+    # （类体中 field 已是字段名，这里需通过模块引用 dataclasses.field）
+    _compiled: Optional[re.Pattern] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """初始化后处理：预编译正则匹配条件的模式"""
+        if self.operator in _REGEX_OPERATORS and isinstance(self.value, str):
+            try:
+                self._compiled = re.compile(self.value)
+            except re.error as e:
+                logger.warning(f"条件中的正则表达式无效: {self.value!r}, 错误: {e}")
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -88,14 +128,14 @@ class Condition:
     def from_dict(cls, data: Dict[str, Any]) -> 'Condition':
         """从字典创建条件"""
         return cls(
-            type=data['type'],
-            operator=data['operator'],
+            type=sys.intern(data['type']),
+            operator=sys.intern(data['operator']),
             value=data['value'],
             field=data.get('field')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """自动化动作"""
     type: str                       # 动作类型
@@ -118,7 +158,7 @@ class Action:
     def from_dict(cls, data: Dict[str, Any]) -> 'Action':
         """从字典创建动作"""
         return cls(
-            type=data['type'],
+            type=sys.intern(data['type']),
             parameters=data['parameters'],
             delay=data.get('delay', 0),
             retry_count=data.get('retry_count', 0),
@@ -126,7 +166,7 @@ class Action:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeRange:
     """时间范围"""
     start: time                     # 开始时间
@@ -144,16 +184,14 @@ class TimeRange:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TimeRange':
         """从字典创建时间范围"""
-        start_time = datetime.strptime(data['start'], '%H:%M:%S').time()
-        end_time = datetime.strptime(data['end'], '%H:%M:%S').time()
         return cls(
-            start=start_time,
-            end=end_time,
+            start=_parse_time(data['start']),
+            end=_parse_time(data['end']),
             timezone=data.get('timezone', 'local')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionRecord:
     """执行记录"""
     rule_id: str
@@ -181,7 +219,7 @@ class ExecutionRecord:
         """从字典创建执行记录"""
         return cls(
             rule_id=data['rule_id'],
-            executed_at=datetime.fromisoformat(data['executed_at']),
+            executed_at=_parse_dt(data['executed_at']),
             pr_info=data['pr_info'],
             actions_executed=data['actions_executed'],
             success=data['success'],
@@ -190,7 +228,7 @@ class ExecutionRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationRule:
     """自动化规则"""
     id: str                         # 规则ID
@@ -214,10 +252,12 @@ class AutomationRule:
     
     def __post_init__(self):
         """初始化后处理"""
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -253,7 +293,7 @@ class AutomationRule:
             id=data['id'],
             name=data['name'],
             description=data['description'],
-            trigger=data['trigger'],
+            trigger=sys.intern(data['trigger']),
             conditions=conditions,
             actions=actions,
             enabled=data.get('enabled', True),
@@ -262,9 +302,9 @@ class AutomationRule:
             cooldown=data.get('cooldown', 0),
             max_executions_per_day=data.get('max_executions_per_day'),
             tags=data.get('tags', []),
-            created_at=datetime.fromisoformat(data['created_at']) if data.get('created_at') else None,
-            updated_at=datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None,
-            last_executed=datetime.fromisoformat(data['last_executed']) if data.get('last_executed') else None,
+            created_at=_parse_dt(data['created_at']) if data.get('created_at') else None,
+            updated_at=_parse_dt(data['updated_at']) if data.get('updated_at') else None,
+            last_executed=_parse_dt(data['last_executed']) if data.get('last_executed') else None,
             execution_count=data.get('execution_count', 0),
             success_count=data.get('success_count', 0),
             failure_count=data.get('failure_count', 0)
@@ -277,11 +317,10 @@ class AutomationRule:
             self.success_count += 1
         else:
             self.failure_count += 1
-        self.last_executed = datetime.now()
-        self.updated_at = datetime.now()
+        self.last_executed = self.updated_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationConfig:
     """自动化配置"""
     enabled: bool = True
@@ -2,30 +2,225 @@
 自动化引擎模块，处理自动化规则的执行和管理
 """
 import re
+import sys
 import time
+import operator
 import asyncio
 import logging
 import threading
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-import requests
-import json
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Any, Optional, Set, Tuple
+from datetime import date, datetime
+import concurrent.futures
+import aiohttp
 
 from ..models.automation import (
     AutomationRule, Condition, Action, ExecutionRecord, AutomationConfig,
     TriggerType, ConditionType, ActionType, OperatorType
 )
 from ..api.base_api import BaseAPIClient
+from ..api import async_runner
+from ..config import fastjson
 
 logger = logging.getLogger(__name__)
 
 
+# 动作类型的字符串值，导入时取出一次；Action.type 在加载时已驻留，比较时无需经过枚举属性查找
+_ACTION_COMMENT = sys.intern(ActionType.COMMENT.value)
+_ACTION_ADD_LABEL = sys.intern(ActionType.ADD_LABEL.value)
+_ACTION_REMOVE_LABEL = sys.intern(ActionType.REMOVE_LABEL.value)
+_ACTION_CLOSE_PR = sys.intern(ActionType.CLOSE_PR.value)
+_ACTION_WEBHOOK = sys.intern(ActionType.WEBHOOK.value)
+_ACTION_LOG = sys.intern(ActionType.LOG.value)
+# 修改PR标签的动作，同一规则中需按顺序执行
+_LABEL_ACTIONS = frozenset((_ACTION_ADD_LABEL, _ACTION_REMOVE_LABEL))
+
+
+# 模板变量名，模板中写作 {{变量名}}
+_TEMPLATE_VARIABLES = (
+    'pr.number', 'pr.title', 'pr.author', 'pr.state', 'pr.url',
+    'repo.full_name', 'repo.name', 'repo.owner',
+    'branch.head', 'branch.base', 'platform', 'timestamp',
+)
+_TEMPLATE_RE = re.compile(r"\{\{(" + "|".join(map(re.escape, _TEMPLATE_VARIABLES)) + r")\}\}")
+
+
+def _query_params(payload: Any) -> Any:
+    """
+    将 GET webhook 的载荷转换为查询参数：值为 None 的键省略，列表展开为重复的键，其他值转换为字符串
+    （aiohttp 只接受字符串和数字作为参数值）
+    """
+    if not isinstance(payload, dict):
+        return payload
+    params = []
+    for key, value in payload.items():
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple)) else (value,):
+            params.append((str(key), str(item)))
+    return params
+
+
+def _label_names(pr_data: dict, context: Optional[dict]) -> List[str]:
+    return [label.get('name', '') for label in pr_data.get('labels', [])]
+
+
+def _state(pr_data: dict, context: Optional[dict]) -> str:
+    return pr_data.get('state', '')
+
+
+def _author(pr_data: dict, context: Optional[dict]) -> str:
+    return pr_data.get('user', {}).get('login', '')
+
+
+def _platform(pr_data: dict, context: Optional[dict]) -> str:
+    return context.get('platform', '') if context else ''
+
+
+def _repo_full_name(pr_data: dict, context: Optional[dict]) -> str:
+    return f"{pr_data.get('base', {}).get('repo', {}).get('full_name', '')}"
+
+
+def _head_ref(pr_data: dict, context: Optional[dict]) -> str:
+    return pr_data.get('head', {}).get('ref', '')
+
+
+def _title(pr_data: dict, context: Optional[dict]) -> str:
+    return pr_data.get('title', '')
+
+
+def _body(pr_data: dict, context: Optional[dict]) -> str:
+    return pr_data.get('body', '') or ''
+
+
+def _draft(pr_data: dict, context: Optional[dict]) -> bool:
+    return pr_data.get('draft', False)
+
+
+def _now_time(pr_data: dict, context: Optional[dict]) -> Any:
+    return datetime.now().time()
+
+
+# 条件类型 -> 字段取值函数，导入时构建一次，评估时只需一次字典查找
+_FIELD_GETTERS: Dict[str, Callable[[dict, Optional[dict]], Any]] = {
+    ConditionType.HAS_LABEL.value: _label_names,
+    ConditionType.NOT_HAS_LABEL.value: _label_names,
+    ConditionType.STATUS_IS.value: _state,
+    ConditionType.STATUS_NOT.value: _state,
+    ConditionType.AUTHOR_IS.value: _author,
+    ConditionType.AUTHOR_NOT.value: _author,
+    ConditionType.PLATFORM_IS.value: _platform,
+    ConditionType.REPO_IS.value: _repo_full_name,
+    ConditionType.BRANCH_MATCHES.value: _head_ref,
+    ConditionType.TITLE_CONTAINS.value: _title,
+    ConditionType.BODY_CONTAINS.value: _body,
+    ConditionType.IS_DRAFT.value: _draft,
+    ConditionType.IS_NOT_DRAFT.value: _draft,
+    ConditionType.TIME_RANGE.value: _now_time,
+}
+
+
+# 条件的相对评估开销：简单字段比较最低，需要遍历标签列表或扫描长文本的较高
+_CONDITION_COST: Dict[str, int] = {
+    ConditionType.PLATFORM_IS.value: 0,
+    ConditionType.STATUS_IS.value: 0,
+    ConditionType.STATUS_NOT.value: 0,
+    ConditionType.IS_DRAFT.value: 0,
+    ConditionType.IS_NOT_DRAFT.value: 0,
+    ConditionType.AUTHOR_IS.value: 1,
+    ConditionType.AUTHOR_NOT.value: 1,
+    ConditionType.REPO_IS.value: 1,
+    ConditionType.BRANCH_MATCHES.value: 1,
+    ConditionType.TIME_RANGE.value: 1,
+    ConditionType.TITLE_CONTAINS.value: 2,
+    ConditionType.BODY_CONTAINS.value: 3,
+    ConditionType.HAS_LABEL.value: 3,
+    ConditionType.NOT_HAS_LABEL.value: 3,
+}
+# 正则匹配类操作符额外增加的开销
+_REGEX_COST = 5
+
+
+def _condition_cost(condition: Condition) -> int:
+    """估算条件的评估开销，用于确定规则中条件的评估顺序"""
+    cost = _CONDITION_COST.get(condition.type, 2)
+    if condition._compiled is not None:
+        cost += _REGEX_COST
+    return cost
+
+
+def _contains(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(field_value, (list, tuple, str)):
+        return condition_value in field_value
+    return False
+
+
+def _not_contains(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(field_value, (list, tuple, str)):
+        return condition_value not in field_value
+    return True
+
+
+def _in(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(condition_value, (list, tuple)):
+        return field_value in condition_value
+    return False
+
+
+def _not_in(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(condition_value, (list, tuple)):
+        return field_value not in condition_value
+    return True
+
+
+def _matches(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(field_value, str):
+        if pattern is not None:
+            return pattern.search(field_value) is not None
+        return bool(re.search(condition_value, field_value))
+    return False
+
+
+def _not_matches(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+    if isinstance(field_value, str):
+        if pattern is not None:
+            return pattern.search(field_value) is None
+        return not bool(re.search(condition_value, field_value))
+    return True
+
+
+def _numeric(compare: Callable[[float, float], bool]) -> Callable[[Any, Any, Optional[re.Pattern]], bool]:
+    """构造数值比较函数，无法转换为数字时视为不满足"""
+    def _compare(field_value: Any, condition_value: Any, pattern: Optional[re.Pattern]) -> bool:
+        try:
+            return compare(float(field_value), float(condition_value))
+        except (ValueError, TypeError):
+            return False
+    return _compare
+
+
+# 操作符 -> 比较函数，参数为 (字段值, 条件值, 预编译正则)
+_COMPARATORS: Dict[str, Callable[[Any, Any, Optional[re.Pattern]], bool]] = {
+    OperatorType.EQUALS.value: lambda field_value, condition_value, pattern: field_value == condition_value,
+    OperatorType.NOT_EQUALS.value: lambda field_value, condition_value, pattern: field_value != condition_value,
+    OperatorType.CONTAINS.value: _contains,
+    OperatorType.NOT_CONTAINS.value: _not_contains,
+    OperatorType.IN.value: _in,
+    OperatorType.NOT_IN.value: _not_in,
+    OperatorType.MATCHES.value: _matches,
+    OperatorType.NOT_MATCHES.value: _not_matches,
+    OperatorType.GREATER_THAN.value: _numeric(operator.gt),
+    OperatorType.LESS_THAN.value: _numeric(operator.lt),
+    OperatorType.GREATER_EQUAL.value: _numeric(operator.ge),
+    OperatorType.LESS_EQUAL.value: _numeric(operator.le),
+}
+
+
 class ConditionEvaluator:
     """条件评估器"""
     
     @staticmethod
-    def evaluate(condition: Condition, pr_data: dict, context: dict = None) -> bool:
+    def evaluate(condition: Condition, pr_data: dict, context: dict = None, cache: dict = None) -> bool:
         """
         评估单个条件
         
@@ -33,142 +228,44 @@ class ConditionEvaluator:
             condition: 条件对象
             pr_data: PR数据
             context: 上下文数据
+            cache: 同一事件内共享的字段值缓存，多个条件用到的标签名列表只提取一次
             
         Returns:
             条件是否满足
         """
         try:
-            field_value = ConditionEvaluator._get_field_value(condition, pr_data, context)
+            field_value = ConditionEvaluator._get_field_value(condition, pr_data, context, cache)
             return ConditionEvaluator._compare_values(
-                condition.operator, field_value, condition.value
+                condition.operator, field_value, condition.value, condition._compiled
             )
         except Exception as e:
             logger.error(f"条件评估失败: {condition.type}, 错误: {e}")
             return False
     
     @staticmethod
-    def _get_field_value(condition: Condition, pr_data: dict, context: dict = None) -> Any:
+    def _get_field_value(condition: Condition, pr_data: dict, context: dict = None, cache: dict = None) -> Any:
         """获取字段值"""
-        condition_type = condition.type
-        
-        if condition_type == ConditionType.HAS_LABEL.value:
-            labels = pr_data.get('labels', [])
-            return [label.get('name', '') for label in labels]
-        
-        elif condition_type == ConditionType.NOT_HAS_LABEL.value:
-            labels = pr_data.get('labels', [])
-            return [label.get('name', '') for label in labels]
-        
-        elif condition_type == ConditionType.STATUS_IS.value:
-            return pr_data.get('state', '')
-        
-        elif condition_type == ConditionType.STATUS_NOT.value:
-            return pr_data.get('state', '')
-        
-        elif condition_type == ConditionType.AUTHOR_IS.value:
-            return pr_data.get('user', {}).get('login', '')
-        
-        elif condition_type == ConditionType.AUTHOR_NOT.value:
-            return pr_data.get('user', {}).get('login', '')
-        
-        elif condition_type == ConditionType.PLATFORM_IS.value:
-            return context.get('platform', '') if context else ''
-        
-        elif condition_type == ConditionType.REPO_IS.value:
-            return f"{pr_data.get('base', {}).get('repo', {}).get('full_name', '')}"
-        
-        elif condition_type == ConditionType.BRANCH_MATCHES.value:
-            return pr_data.get('head', {}).get('ref', '')
-        
-        elif condition_type == ConditionType.TITLE_CONTAINS.value:
-            return pr_data.get('title', '')
-        
-        elif condition_type == ConditionType.BODY_CONTAINS.value:
-            return pr_data.get('body', '') or ''
-        
-        elif condition_type == ConditionType.IS_DRAFT.value:
-            return pr_data.get('draft', False)
-        
-        elif condition_type == ConditionType.IS_NOT_DRAFT.value:
-            return pr_data.get('draft', False)
-        
-        elif condition_type == ConditionType.TIME_RANGE.value:
-            return datetime.now().time()
-        
-        else:
-            # 使用字段名直接获取值
-            if condition.field:
-                return pr_data.get(condition.field, '')
-            return ''
+        getter = _FIELD_GETTERS.get(condition.type)
+        if getter is _label_names and cache is not None:
+            labels = cache.get('labels')
+            if labels is None:
+                labels = cache['labels'] = _label_names(pr_data, context)
+            return labels
+        if getter is not None:
+            return getter(pr_data, context)
+        # 使用字段名直接获取值
+        if condition.field:
+            return pr_data.get(condition.field, '')
+        return ''
     
     @staticmethod
-    def _compare_values(operator: str, field_value: Any, condition_value: Any) -> bool:
-        """比较值"""
-        if operator == OperatorType.EQUALS.value:
-            return field_value == condition_value
-        
-        elif operator == OperatorType.NOT_EQUALS.value:
-            return field_value != condition_value
-        
-        elif operator == OperatorType.CONTAINS.value:
-            if isinstance(field_value, (list, tuple)):
-                return condition_value in field_value
-            elif isinstance(field_value, str):
-                return condition_value in field_value
-            return False
-        
-        elif operator == OperatorType.NOT_CONTAINS.value:
-            if isinstance(field_value, (list, tuple)):
-                return condition_value not in field_value
-            elif isinstance(field_value, str):
-                return condition_value not in field_value
-            return True
-        
-        elif operator == OperatorType.IN.value:
-            if isinstance(condition_value, (list, tuple)):
-                return field_value in condition_value
-            return False
-        
-        elif operator == OperatorType.NOT_IN.value:
-            if isinstance(condition_value, (list, tuple)):
-                return field_value not in condition_value
-            return True
-        
-        elif operator == OperatorType.MATCHES.value:
-            if isinstance(field_value, str):
-                return bool(re.search(condition_value, field_value))
+    def _compare_values(operator: str, field_value: Any, condition_value: Any,
+                        pattern: Optional[re.Pattern] = None) -> bool:
+        """比较值，pattern 为条件加载时预编译的正则（仅正则匹配类操作符）"""
+        compare = _COMPARATORS.get(operator)
+        if compare is None:
             return False
-        
-        elif operator == OperatorType.NOT_MATCHES.value:
-            if isinstance(field_value, str):
-                return not bool(re.search(condition_value, field_value))
-            return True
-        
-        elif operator == OperatorType.GREATER_THAN.value:
-            try:
-                return float(field_value) > float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        
-        elif operator == OperatorType.LESS_THAN.value:
-            try:
-                return float(field_value) < float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        
-        elif operator == OperatorType.GREATER_EQUAL.value:
-            try:
-                return float(field_value) >= float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        
-        elif operator == OperatorType.LESS_EQUAL.value:
-            try:
-                return float(field_value) <= float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        
-        return False
+        return compare(field_value, condition_value, pattern)
 
 
 class ActionExecutor:
@@ -176,6 +273,31 @@ class ActionExecutor:
     
     def __init__(self, api_clients: Dict[str, BaseAPIClient]):
         self.api_clients = api_clients
+        # webhook 使用的 aiohttp 会话，在后台事件循环中首次调用时创建，复用到同一地址的 TCP/TLS 连接
+        self._http: Optional[aiohttp.ClientSession] = None
+    
+    def close(self) -> None:
+        """关闭 webhook 会话（需在后台事件循环停止之前调用）"""
+        http, self._http = self._http, None
+        if http is None or http.closed:
+            return
+        try:
+            async_runner.run_sync(http.close(), timeout=5)
+        except Exception as e:
+            logger.warning(f"关闭 webhook 会话失败: {e}")
+    
+    def _webhook_session(self) -> Optional[aiohttp.ClientSession]:
+        """
+        获取可复用的 webhook 会话
+        
+        aiohttp 会话绑定创建它的事件循环，只有在长期运行的后台事件循环中才能复用；
+        在其他事件循环中调用时返回 None，由调用方创建临时会话
+        """
+        if not async_runner.in_background_loop():
+            return None
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self._http
     
     async def execute(self, action: Action, pr_data: dict, context: dict = None) -> bool:
         """
@@ -221,22 +343,22 @@ class ActionExecutor:
             return False
         
         try:
-            if action_type == ActionType.COMMENT.value:
+            if action_type == _ACTION_COMMENT:
                 return await self._execute_comment(action, pr_data, api_client, context)
             
-            elif action_type == ActionType.ADD_LABEL.value:
+            elif action_type == _ACTION_ADD_LABEL:
                 return await self._execute_add_label(action, pr_data, api_client, context)
             
-            elif action_type == ActionType.REMOVE_LABEL.value:
+            elif action_type == _ACTION_REMOVE_LABEL:
                 return await self._execute_remove_label(action, pr_data, api_client, context)
             
-            elif action_type == ActionType.CLOSE_PR.value:
+            elif action_type == _ACTION_CLOSE_PR:
                 return await self._execute_close_pr(action, pr_data, api_client, context)
             
-            elif action_type == ActionType.WEBHOOK.value:
+            elif action_type == _ACTION_WEBHOOK:
                 return await self._execute_webhook(action, pr_data, context)
             
-            elif action_type == ActionType.LOG.value:
+            elif action_type == _ACTION_LOG:
                 return await self._execute_log(action, pr_data, context)
             
             else:
@@ -303,14 +425,19 @@ class ActionExecutor:
         repo = pr_data.get('base', {}).get('repo', {}).get('name', '')
         pr_number = pr_data.get('number', 0)
         
-        try:
-            for label in labels:
-                await api_client.remove_pr_label(owner, repo, pr_number, label)
-            logger.info(f"成功移除标签从 PR {owner}/{repo}#{pr_number}: {labels}")
-            return True
-        except Exception as e:
-            logger.error(f"移除标签失败: {e}")
+        # 各标签的删除请求互不依赖，并发发送
+        results = await asyncio.gather(
+            *[api_client.remove_pr_label(owner, repo, pr_number, label) for label in labels],
+            return_exceptions=True
+        )
+        # CancelledError 等 BaseException 和客户端返回的 False 同样视为失败
+        failed = {label: result for label, result in zip(labels, results)
+                  if isinstance(result, BaseException) or not result}
+        if failed:
+            logger.error(f"移除标签失败 PR {owner}/{repo}#{pr_number}: {failed}")
             return False
+        logger.info(f"成功移除标签从 PR {owner}/{repo}#{pr_number}: {labels}")
+        return True
     
     async def _execute_close_pr(self, action: Action, pr_data: dict, api_client: BaseAPIClient, context: dict) -> bool:
         """执行关闭PR动作"""
@@ -337,24 +464,32 @@ class ActionExecutor:
             logger.error("Webhook URL不能为空")
             return False
         
-        # 替换模板变量
-        payload_str = json.dumps(payload)
-        payload_str = self._replace_template_variables(payload_str, pr_data, context)
-        payload = json.loads(payload_str)
+        # 替换模板变量：直接替换载荷中的字符串，无需先序列化为 JSON 文本再解析
+        payload = self._substitute_tree(payload, self._template_variables(pr_data, context))
+        
+        if method == 'GET':
+            kwargs = {'headers': headers, 'params': _query_params(payload)}
+        else:
+            kwargs = {'headers': {'Content-Type': 'application/json', **headers}, 'data': fastjson.dumps(payload)}
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=payload, timeout=30)
-            else:
-                response = requests.request(method, url, headers=headers, json=payload, timeout=30)
-            
-            response.raise_for_status()
-            logger.info(f"Webhook调用成功: {method} {url}, 状态码: {response.status_code}")
-            return True
+            session = self._webhook_session()
+            if session is not None:
+                return await self._send_webhook(session, method, url, kwargs)
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+                return await self._send_webhook(session, method, url, kwargs)
         except Exception as e:
             logger.error(f"Webhook调用失败: {e}")
             return False
     
+    @staticmethod
+    async def _send_webhook(session: aiohttp.ClientSession, method: str, url: str, kwargs: Dict[str, Any]) -> bool:
+        """发送 webhook 请求，非 2xx 响应抛出 aiohttp.ClientResponseError"""
+        async with session.request(method, url, **kwargs) as response:
+            response.raise_for_status()
+            logger.info(f"Webhook调用成功: {method} {url}, 状态码: {response.status}")
+            return True
+    
     async def _execute_log(self, action: Action, pr_data: dict, context: dict) -> bool:
         """执行日志动作"""
         message = action.parameters.get('message', '')
@@ -377,31 +512,68 @@ class ActionExecutor:
         return True
     
     def _replace_template_variables(self, text: str, pr_data: dict, context: dict) -> str:
-        """替换模板变量"""
-        variables = {
-            '{{pr.number}}': str(pr_data.get('number', '')),
-            '{{pr.title}}': pr_data.get('title', ''),
-            '{{pr.author}}': pr_data.get('user', {}).get('login', ''),
-            '{{pr.state}}': pr_data.get('state', ''),
-            '{{pr.url}}': pr_data.get('html_url', ''),
-            '{{repo.full_name}}': pr_data.get('base', {}).get('repo', {}).get('full_name', ''),
-            '{{repo.name}}': pr_data.get('base', {}).get('repo', {}).get('name', ''),
-            '{{repo.owner}}': pr_data.get('base', {}).get('repo', {}).get('owner', {}).get('login', ''),
-            '{{branch.head}}': pr_data.get('head', {}).get('ref', ''),
-            '{{branch.base}}': pr_data.get('base', {}).get('ref', ''),
-            '{{platform}}': context.get('platform', '') if context else '',
-            '{{timestamp}}': datetime.now().isoformat(),
+        """替换模板变量，所有变量在一次正则扫描中替换"""
+        if '{{' not in text:
+            return text
+        return self._substitute(text, self._template_variables(pr_data, context))
+    
+    @staticmethod
+    def _template_variables(pr_data: dict, context: dict) -> Dict[str, str]:
+        """构造模板变量名到值的映射"""
+        return {
+            'pr.number': str(pr_data.get('number', '')),
+            'pr.title': pr_data.get('title', ''),
+            'pr.author': pr_data.get('user', {}).get('login', ''),
+            'pr.state': pr_data.get('state', ''),
+            'pr.url': pr_data.get('html_url', ''),
+            'repo.full_name': pr_data.get('base', {}).get('repo', {}).get('full_name', ''),
+            'repo.name': pr_data.get('base', {}).get('repo', {}).get('name', ''),
+            'repo.owner': pr_data.get('base', {}).get('repo', {}).get('owner', {}).get('login', ''),
+            'branch.head': pr_data.get('head', {}).get('ref', ''),
+            'branch.base': pr_data.get('base', {}).get('ref', ''),
+            'platform': context.get('platform', '') if context else '',
+            'timestamp': datetime.now().isoformat(),
         }
+    
+    @staticmethod
+    def _substitute(text: str, variables: Dict[str, str]) -> str:
+        """用已构造的变量映射替换文本中的模板变量"""
+        if '{{' not in text:
+            return text
+        return _TEMPLATE_RE.sub(lambda match: str(variables[match.group(1)]), text)
+    
+    @classmethod
+    def _substitute_tree(cls, obj: Any, variables: Dict[str, str]) -> Any:
+        """
+        递归替换字典/列表中所有字符串（包括字典键）里的模板变量
         
-        for var, value in variables.items():
-            text = text.replace(var, str(value))
-        
-        return text
+        Args:
+            obj: 载荷对象
+            variables: 模板变量映射
+            
+        Returns:
+            替换后的新对象，非字符串的标量原样返回
+        """
+        if isinstance(obj, str):
+            return cls._substitute(obj, variables)
+        if isinstance(obj, dict):
+            return {
+                cls._substitute(key, variables) if isinstance(key, str) else key: cls._substitute_tree(value, variables)
+                for key, value in obj.items()
+            }
+        if isinstance(obj, list):
+            return [cls._substitute_tree(item, variables) for item in obj]
+        return obj
 
 
 class AutomationEngine:
     """自动化引擎"""
     
+    # 规则执行统计写回配置的间隔（秒），间隔内的多次执行合并为一次保存
+    STATS_FLUSH_INTERVAL = 5.0
+    # 内存中保留的执行记录条数
+    MAX_HISTORY = 1000
+    
     def __init__(self, api_clients: Dict[str, BaseAPIClient], config_manager, automation_config: AutomationConfig = None):
         """
         初始化自动化引擎
@@ -419,11 +591,19 @@ class AutomationEngine:
         self.config = automation_config or AutomationConfig.from_dict(automation_config_dict)
         
         self.rules: List[AutomationRule] = []
-        self.execution_history: List[ExecutionRecord] = []
+        # 按优先级排序的已启用规则及其按开销排序的条件，规则增删改后置为 None，处理事件时按需重建
+        self._sorted_rules: Optional[List[Tuple[AutomationRule, Tuple[Condition, ...]]]] = None
+        # 超出 MAX_HISTORY 时自动丢弃最早的记录
+        self.execution_history: Deque[ExecutionRecord] = deque(maxlen=self.MAX_HISTORY)
+        # (规则ID, 日期) -> 当日执行次数，随执行记录更新，检查每日次数限制时无需扫描历史
+        self._daily_counts: Dict[Tuple[str, date], int] = defaultdict(int)
         self.condition_evaluator = ConditionEvaluator()
         self.action_executor = ActionExecutor(api_clients)
-        self.thread_pool = ThreadPoolExecutor(max_workers=self.config.max_parallel_executions)
-        self._lock = threading.Lock()
+        # 规则在共享的后台事件循环中执行，同时执行的规则数由信号量限制
+        self._execution_slots = asyncio.Semaphore(self.config.max_parallel_executions)
+        self._pending: Set[concurrent.futures.Future] = set()
+        self._lock = threading.RLock()  # add_rule 等方法持有锁时会调用 save_rules，需可重入
+        self._stats_timer: Optional[threading.Timer] = None
         
         # 加载规则
         self.load_rules()
@@ -445,6 +625,7 @@ class AutomationEngine:
                 return False
             
             self.rules.append(rule)
+            self._sorted_rules = None
             self.save_rules()
             logger.info(f"添加自动化规则: {rule.name} ({rule.id})")
             return True
@@ -464,6 +645,7 @@ class AutomationEngine:
                 if existing_rule.id == rule.id:
                     rule.updated_at = datetime.now()
                     self.rules[i] = rule
+                    self._sorted_rules = None
                     self.save_rules()
                     logger.info(f"更新自动化规则: {rule.name} ({rule.id})")
                     return True
@@ -485,6 +667,7 @@ class AutomationEngine:
             for i, rule in enumerate(self.rules):
                 if rule.id == rule_id:
                     removed_rule = self.rules.pop(i)
+                    self._sorted_rules = None
                     self.save_rules()
                     logger.info(f"移除自动化规则: {removed_rule.name} ({rule_id})")
                     return True
@@ -522,31 +705,62 @@ class AutomationEngine:
         
         context = context or {}
         executed_rules = []
-        
-        # 按优先级排序规则
-        sorted_rules = sorted(
-            [rule for rule in self.rules if rule.enabled],
-            key=lambda r: r.priority,
-            reverse=True        )
-        
-        for rule in sorted_rules:
-            if self._should_execute_rule(rule, event_type, pr_data, context):
-                self.thread_pool.submit(self._execute_rule_sync, rule, pr_data, context)
+        # 本次事件的字段值缓存，由所有规则的条件共享
+        field_cache = {}
+        
+        for rule, conditions in self._get_sorted_rules():
+            if self._should_execute_rule(rule, event_type, pr_data, context, conditions, field_cache):
+                future = async_runner.submit(self._execute_rule_limited(rule, pr_data, context))
+                self._pending.add(future)
+                future.add_done_callback(self._pending.discard)
                 executed_rules.append(rule.id)
         
         return executed_rules
     
-    def _should_execute_rule(self, rule: AutomationRule, event_type: str, pr_data: dict, context: dict) -> bool:
-        """检查是否应该执行规则"""
+    def _get_sorted_rules(self) -> List[Tuple[AutomationRule, Tuple[Condition, ...]]]:
+        """
+        获取按优先级从高到低排序的已启用规则，规则未变化时复用上次的排序结果
+        
+        每条规则附带按评估开销从低到高排序的条件，开销低的条件先评估，不满足时无需再评估正则等昂贵条件；
+        规则本身的条件顺序（保存到配置的顺序）不变
+        """
+        sorted_rules = self._sorted_rules
+        if sorted_rules is None:
+            with self._lock:
+                if self._sorted_rules is None:
+                    rules = sorted(
+                        [rule for rule in self.rules if rule.enabled],
+                        key=operator.attrgetter('priority'),
+                        reverse=True
+                    )
+                    self._sorted_rules = [
+                        (rule, tuple(sorted(rule.conditions, key=_condition_cost))) for rule in rules
+                    ]
+                sorted_rules = self._sorted_rules
+        return sorted_rules
+    
+    def _should_execute_rule(self, rule: AutomationRule, event_type: str, pr_data: dict, context: dict,
+                             conditions: Optional[Tuple[Condition, ...]] = None,
+                             field_cache: Optional[dict] = None) -> bool:
+        """
+        检查是否应该执行规则
+        
+        Args:
+            rule: 自动化规则
+            event_type: 事件类型
+            pr_data: PR数据
+            context: 上下文数据
+            conditions: 按评估开销排序的规则条件，为空时按规则中的顺序评估
+            field_cache: 同一事件内共享的字段值缓存
+            
+        Returns:
+            是否应该执行
+        """
         # 检查触发器
         if rule.trigger != event_type:
             return False
         
-        # 检查条件
-        for condition in rule.conditions:
-            if not self.condition_evaluator.evaluate(condition, pr_data, context):
-                return False
-        
+        # 时间范围、冷却时间和每日次数限制只需比较几个数值，先于条件检查
         # 检查时间范围
         if rule.time_range:
             current_time = datetime.now().time()
@@ -565,15 +779,22 @@ class AutomationEngine:
             if today_executions >= rule.max_executions_per_day:
                 return False
         
+        # 检查条件
+        evaluate = self.condition_evaluator.evaluate
+        for condition in rule.conditions if conditions is None else conditions:
+            if not evaluate(condition, pr_data, context, field_cache):
+                return False
+        
         return True
     
-    def _execute_rule_sync(self, rule: AutomationRule, pr_data: dict, context: dict):
-        """同步执行规则（在线程池中运行）"""
-        asyncio.run(self._execute_rule(rule, pr_data, context))
+    async def _execute_rule_limited(self, rule: AutomationRule, pr_data: dict, context: dict):
+        """在并发执行名额内执行规则"""
+        async with self._execution_slots:
+            await self._execute_rule(rule, pr_data, context)
     
     async def _execute_rule(self, rule: AutomationRule, pr_data: dict, context: dict):
         """执行规则"""
-        start_time = time.time()
+        start_time = time.monotonic()
         executed_actions = []
         success = True
         error_message = None
@@ -581,13 +802,17 @@ class AutomationEngine:
         try:
             logger.info(f"执行自动化规则: {rule.name} ({rule.id})")
             
-            for action in rule.actions:
-                action_success = await self.action_executor.execute(action, pr_data, context)
-                executed_actions.append(f"{action.type}:{action_success}")
-                
-                if not action_success:
-                    success = False
-                    logger.error(f"规则 {rule.id} 中的动作 {action.type} 执行失败")
+            # 同组内的动作互不依赖，并发执行；组与组之间按配置顺序依次执行
+            for group in self._action_groups(rule.actions):
+                results = await asyncio.gather(*[
+                    self.action_executor.execute(action, pr_data, context) for action in group
+                ])
+                for action, action_success in zip(group, results):
+                    executed_actions.append(f"{action.type}:{action_success}")
+                    
+                    if not action_success:
+                        success = False
+                        logger.error(f"规则 {rule.id} 中的动作 {action.type} 执行失败")
         
         except Exception as e:
             success = False
@@ -598,7 +823,7 @@ class AutomationEngine:
             rule.update_statistics(success)
         
         # 记录执行历史
-        execution_time = time.time() - start_time
+        execution_time = time.monotonic() - start_time
         record = ExecutionRecord(
             rule_id=rule.id,
             executed_at=datetime.now(),
@@ -617,31 +842,73 @@ class AutomationEngine:
         
         with self._lock:
             self.execution_history.append(record)
-            # 保持历史记录在合理范围内
-            if len(self.execution_history) > 1000:
-                self.execution_history = self.execution_history[-800:]
+            self._count_execution(rule.id, record.executed_at.date())
         
-        self.save_rules()
+        self._schedule_stats_flush()
         
         if success:
             logger.info(f"规则 {rule.name} 执行成功，耗时 {execution_time:.2f} 秒")
         else:
             logger.error(f"规则 {rule.name} 执行失败: {error_message}")
     
+    @staticmethod
+    def _action_groups(actions: List[Action]) -> List[List[Action]]:
+        """
+        将规则的动作按顺序划分为可并发执行的组
+        
+        以下动作单独成组，保证它之前的动作先完成、之后的动作在它完成后执行：
+        关闭PR；设置了延迟的动作（多个延迟与顺序执行时一样依次累加）。
+        同一组内最多包含一个标签修改动作，同一PR上的添加/移除标签按配置顺序执行
+        
+        Args:
+            actions: 规则中的动作列表
+            
+        Returns:
+            动作组列表，组与组之间按顺序执行
+        """
+        groups = []
+        current = []
+        current_has_label = False
+        for action in actions:
+            is_label = action.type in _LABEL_ACTIONS
+            if action.type == _ACTION_CLOSE_PR or action.delay > 0:
+                if current:
+                    groups.append(current)
+                    current = []
+                    current_has_label = False
+                groups.append([action])
+                continue
+            if is_label and current_has_label:
+                groups.append(current)
+                current = []
+                current_has_label = False
+            current.append(action)
+            current_has_label = current_has_label or is_label
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _count_execution(self, rule_id: str, day: date) -> None:
+        """累加规则当日执行次数（调用方需持有 self._lock）"""
+        counts = self._daily_counts
+        if (rule_id, day) not in counts:
+            # 出现新的日期时顺带清除更早日期的计数
+            for key in [key for key in counts if key[1] < day]:
+                del counts[key]
+        counts[(rule_id, day)] += 1
+    
     def _get_today_executions(self, rule_id: str) -> int:
         """获取今日执行次数"""
-        today = datetime.now().date()
-        count = 0
-        for record in self.execution_history:
-            if record.rule_id == rule_id and record.executed_at.date() == today:
-                count += 1
-        return count
+        return self._daily_counts.get((rule_id, datetime.now().date()), 0)
     
     def get_execution_history(self, rule_id: str = None, limit: int = 100) -> List[ExecutionRecord]:
         """获取执行历史"""
-        history = self.execution_history
-        if rule_id:
-            history = [record for record in history if record.rule_id == rule_id]
+        # 在锁内复制，避免遍历时其他线程追加记录
+        with self._lock:
+            if rule_id:
+                history = [record for record in self.execution_history if record.rule_id == rule_id]
+            else:
+                history = list(self.execution_history)
         return history[-limit:]
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -660,12 +927,32 @@ class AutomationEngine:
             'execution_history_count': len(self.execution_history)
         }
     
+    def _schedule_stats_flush(self) -> None:
+        """规则执行后延迟写回统计信息，STATS_FLUSH_INTERVAL 内的多次执行只保存一次"""
+        with self._lock:
+            if self._stats_timer is not None:
+                return
+            timer = threading.Timer(self.STATS_FLUSH_INTERVAL, self._flush_stats)
+            timer.daemon = True
+            self._stats_timer = timer
+        timer.start()
+    
+    def _flush_stats(self) -> None:
+        """定时器回调：将规则统计写回配置"""
+        with self._lock:
+            self._stats_timer = None
+        self.save_rules()
+    
     def save_rules(self):
         """保存规则到配置文件"""
+        # 保存会写入全部规则（含统计），待执行的统计写回可以取消
+        with self._lock:
+            if self._stats_timer is not None:
+                self._stats_timer.cancel()
+                self._stats_timer = None
         try:
             rules_data = [rule.to_dict() for rule in self.rules]
             self.config_manager.set_automation_rules(rules_data)
-            self.config_manager.save_config()
             logger.debug("规则已保存到配置文件")
         except Exception as e:
             logger.error(f"保存规则失败: {e}")
@@ -681,11 +968,13 @@ class AutomationEngine:
                 return
             
             self.rules = [AutomationRule.from_dict(rule_data) for rule_data in rules_data]
+            self._sorted_rules = None
             logger.info(f"从配置文件加载了 {len(self.rules)} 个自动化规则")
             
         except Exception as e:
             logger.error(f"加载规则失败: {e}")
             self.rules = []
+            self._sorted_rules = None
     
     def _create_default_rules(self):
         """创建默认规则"""
@@ -737,12 +1026,15 @@ class AutomationEngine:
         )
         
         self.rules = [build_rule, retest_rule]
+        self._sorted_rules = None
         self.save_rules()
         logger.info("创建了默认自动化规则")
     
     def shutdown(self):
         """关闭自动化引擎"""
         logger.info("正在关闭自动化引擎...")
-        self.thread_pool.shutdown(wait=True)
+        # 等待已提交的规则执行完成
+        concurrent.futures.wait(list(self._pending))
+        self.action_executor.close()
         self.save_rules()
         logger.info("自动化引擎已关闭")
@@ -5,14 +5,16 @@ import time
 import logging
 import threading
 import asyncio
-from typing import Dict, Any, Set, List, Optional
-from datetime import datetime, timedelta
+import sqlite3
+from typing import Dict, Any, Set, List, Optional, Tuple, Union
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import functools
 
 from ..api.api_client_factory import APIClientFactory
 from ..api.base_api import BaseAPIClient
-from ..models import PullRequest
+from ..api.disk_cache import DiskCache
+from ..api import async_runner
+from ..models import PullRequest, PullRequestLazy
 from ..config.config_manager import Config
 from .automation_engine import AutomationEngine, AutomationConfig
 from ..models.automation import TriggerType
@@ -24,69 +26,106 @@ from ..api import github_api
 logger = logging.getLogger(__name__)
 
 
-def rate_limit(calls_per_second: float = 2.0):
+# 负缓存标记：PR 不存在或无权访问时写入缓存，短时间内的重复查询直接返回 None
+NEGATIVE = object()
+# 负缓存条目的 TTL（秒）
+NEGATIVE_TTL = 30
+
+# PullRequest 用到的字段，列表接口返回的PR包含全部字段时无需再单独请求详情
+PR_DETAIL_FIELDS = frozenset(("number", "labels", "user", "head", "base", "updated_at"))
+
+# PRCache 缓存键：首元素为数据类型（"details"、"labels"、"author_prs"、"info"），其余为定位PR或作者的字段
+CacheKey = Tuple[Any, ...]
+
+
+class PRCache:
     """
-    速率限制装饰器，用于控制API调用频率
-    
-    Args:
-        calls_per_second: 每秒允许的调用次数
+    PR 数据缓存，避免频繁 API 调用
+
+    所有操作都在后台事件循环中执行且内部没有 await，单个字典操作本身是原子的，因此无需加锁；
+    条目保存为 (数据, 过期时间) 元组，过期时间使用 time.monotonic()，命中时只需一次字典查找和一次浮点比较
+
+    TTL 按键自适应：写入的 PR 数据 updated_at 与上次写入时相同（PR 没有变化）时 TTL 翻倍，最长 MAX_TTL；
+    数据发生变化时恢复为基础 TTL。长期不变的已关闭/已合并 PR 因此很少重新请求
     """
-    min_interval = 1.0 / calls_per_second
-    
-    def decorator(func):
-        last_called = [0.0]
-        lock = threading.Lock()
-        
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            with lock:
-                elapsed = time.time() - last_called[0]
-                left_to_wait = min_interval - elapsed
-                if left_to_wait > 0:
-                    time.sleep(left_to_wait)
-                last_called[0] = time.time()
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
 
-class PRCache:
-    """PR 数据缓存，避免频繁 API 调用"""
+    # clear_expired 每批扫描的条目数
+    CLEAR_BATCH_SIZE = 512
+    # 自适应 TTL 的上限（秒）
+    MAX_TTL = 3600
 
     def __init__(self, ttl: int = 300):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache: Dict[CacheKey, Tuple[Any, float]] = {}
         self.ttl = ttl
-        self._lock = asyncio.Lock()
+        # 键 -> (上次写入数据的 updated_at, 当前 TTL)，条目过期后保留，用于下次写入时判断数据是否变化
+        self._versions: Dict[CacheKey, Tuple[str, float]] = {}
 
-    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        async with self._lock:
-            if cache_key in self.cache:
-                entry = self.cache[cache_key]
-                if datetime.now() < entry["expires"]:
-                    return entry["data"]
-                else:
-                    del self.cache[cache_key]
+    @staticmethod
+    def _updated_at(data: Any) -> Optional[str]:
+        """读取缓存数据中 PR 的 updated_at（PR 详情，或 get_pr_info_async 的 {"pr_details": ...}）"""
+        if not isinstance(data, dict):
             return None
+        details = data.get("pr_details")
+        if isinstance(details, dict):
+            data = details
+        return data.get("updated_at")
 
-    async def set(self, cache_key: str, data: Dict[str, Any]) -> None:
-        async with self._lock:
-            self.cache[cache_key] = {
-                "data": data,
-                "expires": datetime.now() + timedelta(seconds=self.ttl)
-            }
+    def _ttl_for(self, cache_key: CacheKey, data: Any) -> float:
+        """计算写入条目的 TTL，并记录本次的 updated_at"""
+        updated_at = self._updated_at(data)
+        if updated_at is None:
+            return self.ttl
+        previous = self._versions.get(cache_key)
+        ttl = min(previous[1] * 2, self.MAX_TTL) if previous and previous[0] == updated_at else self.ttl
+        self._versions[cache_key] = (updated_at, ttl)
+        return ttl
+
+    async def get(self, cache_key: CacheKey) -> Optional[Any]:
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[1] > time.monotonic():
+            return entry[0]
+        self.cache.pop(cache_key, None)
+        return None
+
+    async def set(self, cache_key: CacheKey, data: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存条目
 
-    async def invalidate(self, cache_key: str) -> None:
-        async with self._lock:
-            if cache_key in self.cache:
-                del self.cache[cache_key]
+        Args:
+            cache_key: 缓存键
+            data: 缓存数据
+            ttl: 指定本条目的 TTL（秒），为空时使用自适应 TTL
+        """
+        if ttl is None:
+            ttl = self._ttl_for(cache_key, data)
+        self.cache[cache_key] = (data, time.monotonic() + ttl)
+
+    async def invalidate(self, cache_key: CacheKey) -> None:
+        # 主动失效（强制刷新、修改标签）后重新从基础 TTL 开始
+        self.cache.pop(cache_key, None)
+        self._versions.pop(cache_key, None)
 
     async def clear_expired(self) -> None:
-        async with self._lock:
-            now = datetime.now()
-            expired_keys = [key for key, entry in self.cache.items() if now >= entry["expires"]]
-            for key in expired_keys:
-                del self.cache[key]
-            if expired_keys:
-                logger.debug(f"清除了 {len(expired_keys)} 个过期缓存条目")
+        """
+        清除过期条目
+
+        按 CLEAR_BATCH_SIZE 分批扫描，批次之间让出事件循环，缓存较大时不会长时间阻塞其他读写；
+        让出期间被重新写入的条目不会被误删
+        """
+        now = time.monotonic()
+        items = list(self.cache.items())
+        removed = 0
+        for start in range(0, len(items), self.CLEAR_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            for key, entry in items[start:start + self.CLEAR_BATCH_SIZE]:
+                if entry[1] <= now and self.cache.get(key) is entry:
+                    del self.cache[key]
+                    removed += 1
+        if removed:
+            logger.debug(f"清除了 {removed} 个过期缓存条目")
 
 
 class PRMonitor:
@@ -114,6 +153,9 @@ class PRMonitor:
             self.thread_pool = None
             logger.info("并行处理已禁用，将使用串行处理")
         
+        # API响应磁盘缓存，在首次创建API客户端时按配置打开
+        self.disk_cache: Optional[DiskCache] = None
+        
         # 如果没有指定平台，则自动检测配置中需要的平台
         if platforms is None:
             detected_platforms = set()
@@ -157,7 +199,7 @@ class PRMonitor:
                 continue
                 
             logger.info(f"正在创建{platform}API客户端: api_url={api_url}, has_token={bool(access_token)}")
-            client = APIClientFactory.create_client(platform, api_url, access_token)
+            client = APIClientFactory.create_client(platform, api_url, access_token, **self._client_options())
             
             if client is None:
                 logger.error(f"创建{platform}API客户端失败")
@@ -173,10 +215,10 @@ class PRMonitor:
         # 异步相关设置
         self.max_concurrent_requests = self.config.get("MAX_CONCURRENT_REQUESTS", 10)
         self.semaphore = asyncio.Semaphore(self.max_concurrent_requests)
-        self.requests_per_second = self.config.get("REQUESTS_PER_SECOND_ASYNC", 5.0)
-        self.min_request_interval = 1.0 / self.requests_per_second
-        self.last_request_time = 0.0
-        self._rate_limit_lock = asyncio.Lock()
+        # 未配置共享 Gitee 客户端时按需创建的长期客户端，所有异步方法复用，由 aclose 关闭
+        self._gitee_fallback: Optional[BaseAPIClient] = None
+        # 进行中的 PR 信息获取，key 为缓存键；同一PR的并发请求等待同一次获取结果
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
         
         # 初始化自动化引擎
         automation_config_dict = self.config.get_automation_config()
@@ -232,7 +274,7 @@ class PRMonitor:
                 continue
                 
             logger.info(f"正在重新创建{platform}API客户端: api_url={api_url}, has_token={bool(access_token)}")
-            client = APIClientFactory.create_client(platform, api_url, access_token)
+            client = APIClientFactory.create_client(platform, api_url, access_token, **self._client_options())
             
             if client is None:
                 logger.error(f"创建{platform}API客户端失败")
@@ -243,7 +285,8 @@ class PRMonitor:
         # 更新API客户端字典
         self.api_clients = new_api_clients
         
-        # 重新初始化自动化引擎
+        # 先关闭旧引擎（等待其正在执行的规则，关闭 webhook 会话并写入统计），新引擎再从配置加载规则
+        self.automation_engine.shutdown()
         automation_config_dict = self.config.get_automation_config()
         automation_config = AutomationConfig.from_dict(automation_config_dict)
         self.automation_engine = AutomationEngine(self.api_clients, self.config, automation_config)
@@ -251,6 +294,33 @@ class PRMonitor:
         
         logger.info(f"API客户端重新初始化完成，当前可用平台: {list(self.api_clients.keys())}")
         
+    def _client_options(self) -> Dict[str, Any]:
+        """
+        根据配置生成API客户端的构造选项
+        
+        Returns:
+            传给 APIClientFactory.create_client 的选项字典
+        """
+        disk_cache_path = self.config.get("DISK_CACHE_PATH")
+        if disk_cache_path and self.disk_cache is None:
+            try:
+                self.disk_cache = DiskCache(disk_cache_path, stale_ttl=self.config.get("DISK_CACHE_STALE_TTL", 86400))
+                # 启动时清理已超过 stale_ttl 的条目，避免数据库文件随运行次数无限增长
+                purged = self.disk_cache.purge_expired()
+                logger.info(f"已启用API响应磁盘缓存: {disk_cache_path}，清理过期条目 {purged} 个")
+            except sqlite3.Error as e:
+                logger.error(f"打开磁盘缓存失败: {e}")
+                self.disk_cache = None
+        return {
+            "cache_ttl": self.config.get("API_CACHE_TTL", 30),
+            "cache_size": self.config.get("API_CACHE_SIZE", 4096),
+            "http2": self.config.get("ENABLE_HTTP2", False),
+            "disk_cache": self.disk_cache,
+            "max_concurrency": self.config.get("MAX_CONCURRENT_REQUESTS", 10),
+            # 同一主机的所有客户端共享该速率限制，只有实际发出的请求消耗配额
+            "rate_limit": self.config.get("RATE_LIMIT_PER_SECOND", 1.5),
+        }
+    
     def _get_api_client(self, platform: str) -> Optional[BaseAPIClient]:
         """
         根据平台获取相应的API客户端
@@ -271,6 +341,20 @@ class PRMonitor:
             if client is None:
                 logger.error(f"重新初始化后仍无法获取 {platform} API客户端")
         return client
+    
+    def _invalidate_api_cache(self, platform: str, owner: str, repo: str, pr_id: Optional[int] = None) -> None:
+        """
+        使API客户端中对应仓库或PR的响应缓存失效
+        
+        Args:
+            platform: 平台名称
+            owner: 仓库拥有者
+            repo: 仓库名称
+            pr_id: PR ID，为空时使整个仓库的缓存失效
+        """
+        client = self.api_clients.get(platform)
+        if client is not None:
+            client.invalidate_cache(owner, repo, pr_id)
         
     def start(self) -> None:
         """启动 PR 监控服务"""
@@ -298,9 +382,22 @@ class PRMonitor:
         if hasattr(self, 'automation_engine'):
             self.automation_engine.shutdown()
         
+        # 关闭共享HTTP会话和后台事件循环
+        try:
+            async_runner.run_sync(self.aclose(), timeout=5)
+            async_runner.run_sync(APIClientFactory.aclose_all(), timeout=5)
+        except Exception as e:
+            logger.warning(f"关闭HTTP会话时出错: {e}")
+        async_runner.shutdown()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
+        
+        # 写入尚未保存的配置修改
+        self.config.flush()
+        
         logger.info("PR 监控服务已停止")
     
-    @rate_limit(calls_per_second=1.5)  # 限制每秒1.5次调用
     def get_pr_details(self, platform: str, owner: str, repo: str, pr_id: int, force_refresh: bool = False) -> Optional[PullRequest]:
         """
         获取 PR 的详细信息，优先使用缓存
@@ -315,13 +412,14 @@ class PRMonitor:
         Returns:
             PR 详细信息对象
         """
-        cache_key = f"{platform}:{owner}/{repo}#{pr_id}_details"
+        cache_key = ("details", platform, owner, repo, pr_id)
         
         if force_refresh:
-            asyncio.run(self.cache.invalidate(cache_key))
+            async_runner.run_sync(self.cache.invalidate(cache_key))
+            self._invalidate_api_cache(platform, owner, repo, pr_id)
 
         # 检查缓存
-        cached_data = asyncio.run(self.cache.get(cache_key))
+        cached_data = async_runner.run_sync(self.cache.get(cache_key))
         if cached_data:
             # 确保缓存数据包含平台信息
             if 'platform' not in cached_data:
@@ -334,15 +432,14 @@ class PRMonitor:
             logger.warning(f"无法获取 {platform} API客户端")
             return None
             
-        pr_data = asyncio.run(api_client.get_pr_details(owner, repo, pr_id))
+        pr_data = async_runner.run_sync(api_client.get_pr_details(owner, repo, pr_id))
         if pr_data:
             # 确保PR数据包含平台信息
             pr_data['platform'] = platform
-            asyncio.run(self.cache.set(cache_key, pr_data))
+            async_runner.run_sync(self.cache.set(cache_key, pr_data))
             return PullRequest.from_dict(pr_data)
         return None
     
-    @rate_limit(calls_per_second=1.5)  # 限制每秒1.5次调用
     def get_pr_labels(self, platform: str, owner: str, repo: str, pr_id: int, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
         获取 PR 的标签，优先使用缓存
@@ -357,13 +454,14 @@ class PRMonitor:
         Returns:
             PR 标签列表
         """
-        cache_key = f"{platform}:{owner}/{repo}#{pr_id}"
+        cache_key = ("labels", platform, owner, repo, pr_id)
         
         if force_refresh:
-            asyncio.run(self.cache.invalidate(cache_key))
+            async_runner.run_sync(self.cache.invalidate(cache_key))
+            self._invalidate_api_cache(platform, owner, repo, pr_id)
 
         # 检查缓存
-        cached_data = asyncio.run(self.cache.get(cache_key))
+        cached_data = async_runner.run_sync(self.cache.get(cache_key))
         if cached_data:
             return cached_data
             
@@ -373,12 +471,73 @@ class PRMonitor:
             logger.warning(f"无法获取 {platform} API客户端")
             return []
             
-        labels = asyncio.run(api_client.get_pr_labels(owner, repo, pr_id))
+        labels = async_runner.run_sync(api_client.get_pr_labels(owner, repo, pr_id))
         if labels:
-            asyncio.run(self.cache.set(cache_key, labels))
+            async_runner.run_sync(self.cache.set(cache_key, labels))
             return labels
         return []
     
+    async def _get_pr_details_batch_async(self, tasks: List[Tuple[str, str, str, int]],
+                                          force_refresh: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """
+        在后台事件循环中批量获取PR详情：先查缓存，未命中的PR跨平台一次性并发请求
+        
+        Args:
+            tasks: (platform, owner, repo, pr_id) 列表
+            force_refresh: 是否强制刷新缓存
+            
+        Returns:
+            与输入顺序一致的PR数据列表，获取失败的项为None
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        pending = []
+        for index, (platform, owner, repo, pr_id) in enumerate(tasks):
+            cache_key = ("details", platform, owner, repo, pr_id)
+            if force_refresh:
+                await self.cache.invalidate(cache_key)
+                self._invalidate_api_cache(platform, owner, repo, pr_id)
+            else:
+                cached_data = await self.cache.get(cache_key)
+                if cached_data:
+                    cached_data.setdefault('platform', platform)
+                    results[index] = cached_data
+                    continue
+            pending.append(index)
+        
+        if pending:
+            pr_requests = [
+                {"platform": tasks[i][0], "owner": tasks[i][1], "repo": tasks[i][2], "pr_id": tasks[i][3]}
+                for i in pending
+            ]
+            fetched = await APIClientFactory.gather_pr_details(self.api_clients, pr_requests)
+            for index, pr_data in zip(pending, fetched):
+                if pr_data:
+                    platform, owner, repo, pr_id = tasks[index]
+                    # 确保PR数据包含平台信息
+                    pr_data['platform'] = platform
+                    await self.cache.set(("details", platform, owner, repo, pr_id), pr_data)
+                    results[index] = pr_data
+        return results
+    
+    def _get_pr_details_batch(self, tasks: List[Tuple[str, str, str, int]],
+                              force_refresh: bool = False) -> List[Optional[PullRequestLazy]]:
+        """
+        批量获取PR详情
+        
+        Args:
+            tasks: (platform, owner, repo, pr_id) 列表
+            force_refresh: 是否强制刷新缓存
+            
+        Returns:
+            与输入顺序一致的PR惰性视图列表，获取失败的项为None；
+            轮询只读取标签等少数字段，嵌套对象在访问时才构造
+        """
+        # 缺少客户端的平台先尝试重新初始化，避免在事件循环中执行同步的配置加载
+        for platform in {task[0] for task in tasks}:
+            self._get_api_client(platform)
+        results = async_runner.run_sync(self._get_pr_details_batch_async(tasks, force_refresh))
+        return [PullRequestLazy(pr_data) if pr_data else None for pr_data in results]
+    
     def get_all_pr_labels(self, force_refresh: bool = False) -> Dict[str, List[str]]:
         """
         获取所有监控的 PR 的标签（支持并行处理）
@@ -413,24 +572,9 @@ class PRMonitor:
         # 根据配置选择并行或串行处理
         if self.enable_parallel and self.thread_pool:
             # 并行获取PR详情
-            future_to_key = {}
-            for platform, owner, repo, pr_id in tasks:
+            for (platform, owner, repo, pr_id), pr_details in zip(tasks, self._get_pr_details_batch(tasks, force_refresh)):
                 cache_key = f"{platform}:{owner}/{repo}#{pr_id}"
-                future = self.thread_pool.submit(self.get_pr_details, platform, owner, repo, pr_id, force_refresh)
-                future_to_key[future] = cache_key
-            
-            # 收集结果
-            for future in as_completed(future_to_key):
-                cache_key = future_to_key[future]
-                try:
-                    pr_details = future.result()
-                    if pr_details:
-                        result[cache_key] = [label.name for label in pr_details.labels]
-                    else:
-                        result[cache_key] = []
-                except Exception as e:
-                    logger.error(f"获取 {cache_key} 详情时出错: {e}")
-                    result[cache_key] = []
+                result[cache_key] = pr_details.get_label_names() if pr_details else []
         else:
             # 串行处理
             for platform, owner, repo, pr_id in tasks:
@@ -475,13 +619,14 @@ class PRMonitor:
             
             if author and repo_full and "/" in repo_full:
                 owner, repo = repo_full.split("/", 1)
-                cache_key = f"{platform}:{author}@{owner}/{repo}"
+                cache_key = ("author_prs", platform, author, owner, repo)
                 
                 if force_refresh:
-                    asyncio.run(self.cache.invalidate(cache_key))
+                    async_runner.run_sync(self.cache.invalidate(cache_key))
+                    self._invalidate_api_cache(platform, owner, repo)
 
                 # 检查缓存
-                cached_data = asyncio.run(self.cache.get(cache_key))
+                cached_data = async_runner.run_sync(self.cache.get(cache_key))
                 if cached_data:
                     # 直接使用缓存数据
                     for pr_data in cached_data:
@@ -525,13 +670,8 @@ class PRMonitor:
                 except Exception as e:
                     logger.error(f"获取作者 {author} 在 {platform}:{owner}/{repo} 的PR时出错: {e}")
         
-        # 保存配置以保存自动添加的PR
-        if auto_add_to_monitor and all_prs:
-            self.config.save_config()
-            
         return all_prs
     
-    @rate_limit(calls_per_second=1.0)  # 获取作者PR的调用频率稍低
     def _get_author_prs_single(self, platform: str, author: str, owner: str, repo: str) -> List[Dict[str, Any]]:
         """
         获取单个作者在单个仓库的PR列表（线程池中执行）
@@ -550,7 +690,7 @@ class PRMonitor:
             logger.warning(f"无法获取 {platform} API客户端")
             return []
         
-        return asyncio.run(api_client.get_author_prs(owner, repo, author)) or []
+        return async_runner.run_sync(api_client.get_author_prs(owner, repo, author)) or []
     
     def _process_author_prs_data(self, prs_data: List[Dict[str, Any]], platform: str, author: str, owner: str, repo: str, auto_add_to_monitor: bool, all_prs: List[PullRequest]):
         """
@@ -566,8 +706,10 @@ class PRMonitor:
             all_prs: 所有PR列表（会被修改）
         """
         if prs_data:
-            cache_key = f"{platform}:{author}@{owner}/{repo}"
-            asyncio.run(self.cache.set(cache_key, prs_data))
+            # GitHub 搜索接口返回的条目不含 head/base 等字段，只缓存字段完整的列表，避免之后从缓存构造出不完整的PR
+            if all(PR_DETAIL_FIELDS <= pr_data.keys() for pr_data in prs_data):
+                cache_key = ("author_prs", platform, author, owner, repo)
+                async_runner.run_sync(self.cache.set(cache_key, prs_data))
             
             # 将PR数据转换为PullRequest对象
             for pr_data in prs_data:
@@ -591,18 +733,8 @@ class PRMonitor:
         if not auto_add_to_monitor:
             return
             
-        # 检查PR是否已在监控列表中
-        is_monitored = False
-        for pr_config in self.config.get_pr_lists():
-            if (pr_config.get("PLATFORM", "gitee") == platform and
-                pr_config.get("OWNER") == owner and 
-                pr_config.get("REPO") == repo and 
-                pr_config.get("PULL_REQUEST_ID") == pr.number):
-                is_monitored = True
-                break
-        
         # 如果不在监控列表中，则添加
-        if not is_monitored:
+        if not self.config.has_pr(owner, repo, pr.number, platform):
             self.add_pr_to_monitor(platform, owner, repo, pr.number)
             logger.info(f"自动添加关注作者的 {platform} PR #{pr.number} ({owner}/{repo}) 到监控列表")
     
@@ -639,17 +771,12 @@ class PRMonitor:
         
         # 根据配置选择并行或串行处理
         if self.enable_parallel and self.thread_pool:
-            # 并行检查PR
-            future_to_task = {}
-            for platform, owner, repo, pr_id in tasks:
-                future = self.thread_pool.submit(self._check_pr, platform, owner, repo, pr_id)
-                future_to_task[future] = (platform, owner, repo, pr_id)
-            
-            # 等待所有任务完成
-            for future in as_completed(future_to_task):
-                platform, owner, repo, pr_id = future_to_task[future]
+            # 并行检查PR：所有平台、仓库的PR在后台事件循环中一次性并发获取
+            for (platform, owner, repo, pr_id), pr_details in zip(tasks, self._get_pr_details_batch(tasks, force_refresh=True)):
+                if not pr_details:
+                    continue
                 try:
-                    future.result()  # 获取结果，如果有异常会抛出
+                    self._update_pr_labels(platform, owner, repo, pr_id, pr_details)
                 except Exception as e:
                     logger.error(f"检查 {platform}:{owner}/{repo}#{pr_id} 时出错: {e}")
         else:
@@ -674,9 +801,22 @@ class PRMonitor:
         pr_details = self.get_pr_details(platform, owner, repo, pr_id, force_refresh=True)
         if not pr_details:
             return
-            
+        self._update_pr_labels(platform, owner, repo, pr_id, pr_details)
+    
+    def _update_pr_labels(self, platform: str, owner: str, repo: str, pr_id: int,
+                          pr_details: Union[PullRequest, PullRequestLazy]) -> None:
+        """
+        根据最新的PR详情检查标签变化并更新保存的标签
+        
+        Args:
+            platform: 平台名称
+            owner: 仓库拥有者
+            repo: 仓库名称
+            pr_id: PR ID
+            pr_details: 最新的PR详情
+        """
         # 从PR详情中提取标签名称
-        label_names = {label.name for label in pr_details.labels}
+        label_names = set(pr_details.get_label_names())
         
         cache_key = f"{platform}:{owner}/{repo}#{pr_id}"
         
@@ -820,8 +960,8 @@ class PRMonitor:
                 if cache_key in self.pr_labels:
                     del self.pr_labels[cache_key]
                 
-                asyncio.run(self.cache.invalidate(cache_key))
-                asyncio.run(self.cache.invalidate(f"{cache_key}_details"))
+                async_runner.run_sync(self.cache.invalidate(("labels", platform, owner, repo, pr_id)))
+                async_runner.run_sync(self.cache.invalidate(("details", platform, owner, repo, pr_id)))
                 
                 return True
             else:
@@ -836,7 +976,8 @@ class PRMonitor:
         """获取自动化引擎实例"""
         return self.automation_engine
     
-    def get_multiple_pr_details(self, pr_list: List[Dict[str, Any]], force_refresh: bool = False) -> List[Optional[PullRequest]]:
+    def get_multiple_pr_details(self, pr_list: List[Dict[str, Any]],
+                                force_refresh: bool = False) -> List[Optional[Union[PullRequest, PullRequestLazy]]]:
         """
         并行获取多个PR的详细信息
         
@@ -852,8 +993,9 @@ class PRMonitor:
         
         # 根据配置选择并行或串行处理
         if self.enable_parallel and self.thread_pool:
-            # 并行获取PR详情
-            future_to_index = {}
+            # 并行获取PR详情，保持原始顺序
+            indexes = []
+            tasks = []
             for i, pr_info in enumerate(pr_list):
                 platform = pr_info.get("platform", "gitee")
                 owner = pr_info.get("owner")
@@ -861,20 +1003,12 @@ class PRMonitor:
                 pr_id = pr_info.get("pr_id")
                 
                 if owner and repo and pr_id:
-                    future = self.thread_pool.submit(self.get_pr_details, platform, owner, repo, pr_id, force_refresh)
-                    future_to_index[future] = i
+                    indexes.append(i)
+                    tasks.append((platform, owner, repo, pr_id))
             
-            # 收集结果，保持原始顺序
             results = [None] * len(pr_list)
-            for future in as_completed(future_to_index):
-                index = future_to_index[future]
-                try:
-                    results[index] = future.result()
-                except Exception as e:
-                    pr_info = pr_list[index]
-                    logger.error(f"获取PR详情时出错 {pr_info.get('platform')}:{pr_info.get('owner')}/{pr_info.get('repo')}#{pr_info.get('pr_id')}: {e}")
-                    results[index] = None
-            
+            for i, pr_details in zip(indexes, self._get_pr_details_batch(tasks, force_refresh)):
+                results[i] = pr_details
             return results
         else:
             # 串行处理
@@ -915,7 +1049,7 @@ class PRMonitor:
         # 根据配置选择并行或串行处理
         if self.enable_parallel and self.thread_pool:
             # 并行获取PR详情
-            future_to_key = {}
+            tasks = []
             for pr_info in pr_list:
                 platform = pr_info.get("platform", "gitee")
                 owner = pr_info.get("owner")
@@ -923,31 +1057,20 @@ class PRMonitor:
                 pr_id = pr_info.get("pr_id")
                 
                 if owner and repo and pr_id:
-                    cache_key = f"{platform}:{owner}/{repo}#{pr_id}"
-                    future = self.thread_pool.submit(self.get_pr_details, platform, owner, repo, pr_id, force_refresh)
-                    future_to_key[future] = cache_key
+                    tasks.append((platform, owner, repo, pr_id))
             
-            # 收集结果
             results = {}
-            for future in as_completed(future_to_key):
-                cache_key = future_to_key[future]
-                try:
-                    pr_details = future.result()
-                    if pr_details:
-                        # 从PR详情中提取标签并转换为字典格式
-                        results[cache_key] = [
-                            {
-                                'id': label.id,
-                                'name': label.name,
-                                'color': label.color,
-                                'description': label.description
-                            } for label in pr_details.labels
-                        ]
-                    else:
-                        results[cache_key] = []
-                except Exception as e:
-                    logger.error(f"获取PR详情时出错 {cache_key}: {e}")
-                    results[cache_key] = []
+            for (platform, owner, repo, pr_id), pr_details in zip(tasks, self._get_pr_details_batch(tasks, force_refresh)):
+                cache_key = f"{platform}:{owner}/{repo}#{pr_id}"
+                # 从PR详情中提取标签并转换为字典格式
+                results[cache_key] = [
+                    {
+                        'id': label.id,
+                        'name': label.name,
+                        'color': label.color,
+                        'description': label.description
+                    } for label in pr_details.labels
+                ] if pr_details else []
             
             return results
         else:
@@ -988,14 +1111,14 @@ class PRMonitor:
         logger.info("开始刷新所有缓存...")
         
         # 刷新PR标签缓存
-        start_time = time.time()
+        start_time = time.monotonic()
         self.get_all_pr_labels(force_refresh=True)
-        pr_time = time.time() - start_time
+        pr_time = time.monotonic() - start_time
         
         # 刷新关注作者PR缓存
-        start_time = time.time()
+        start_time = time.monotonic()
         self.get_followed_author_prs(force_refresh=True, auto_add_to_monitor=False)
-        author_time = time.time() - start_time
+        author_time = time.monotonic() - start_time
         
         logger.info(f"缓存刷新完成 - PR标签: {pr_time:.2f}s, 关注作者PR: {author_time:.2f}s")
     
@@ -1019,60 +1142,155 @@ class PRMonitor:
             "monitor_running": self.running
         }
 
-    async def _rate_limit_async(self):
-        async with self._rate_limit_lock:
-            now = time.time()
-            elapsed = now - self.last_request_time
-            if elapsed < self.min_request_interval:
-                await asyncio.sleep(self.min_request_interval - elapsed)
-            self.last_request_time = time.time()
+    def _get_gitee_client(self) -> BaseAPIClient:
+        """
+        获取 Gitee 客户端
+        
+        优先使用工厂创建的共享客户端，同一PR的并发请求（如轮询与页面加载同时进行）共享响应缓存并合并为一次HTTP请求；
+        共享客户端不存在时按需创建一个长期客户端并在之后的调用中复用，不再为每次请求新建客户端和连接。
+        检查与赋值之间没有 await，在事件循环中不会重复创建
+        """
+        client = self.api_clients.get('gitee')
+        if client is not None:
+            return client
+        if self._gitee_fallback is None:
+            api_url = self.config.get_api_url('gitee')
+            # 不进入客户端上下文：后台事件循环中请求直接使用共享会话池，连接在各次调用间保持复用
+            self._gitee_fallback = gitee_api.GiteeAPIClient(api_url, self.config.get_access_token('gitee'),
+                                                            rate_limiter=APIClientFactory.get_rate_limiter(api_url))
+        return self._gitee_fallback
+    
+    async def aclose(self) -> None:
+        """关闭按需创建的 Gitee 客户端（共享会话池由 APIClientFactory.aclose_all 关闭）"""
+        client, self._gitee_fallback = self._gitee_fallback, None
+        if client is not None:
+            await client.close()
+
+    async def get_pr_info_async(self, owner: str, repo: str, pr_id: int,
+                                _now_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        异步获取 PR 信息，优先使用缓存
 
-    async def get_pr_info_async(self, owner: str, repo: str, pr_id: int) -> Optional[Dict[str, Any]]:
-        cache_key = f"{owner}/{repo}#{pr_id}"
+        Args:
+            owner: 仓库拥有者
+            repo: 仓库名称
+            pr_id: PR ID
+            _now_iso: 写入 last_updated 的时间字符串，批量获取时由调用方统一生成，为空时取当前时间
+
+        Returns:
+            {"pr_details": ..., "last_updated": ...}，获取失败时返回 None
+        """
+        cache_key = ("info", owner, repo, pr_id)
         cached = await self.cache.get(cache_key)
+        if cached is NEGATIVE:
+            return None
         if cached:
             logger.debug(f"从缓存获取 PR #{pr_id} 信息")
             return cached
 
+        # 同一PR已有获取在进行中时直接等待其结果，不再占用并发名额和发起请求
+        inflight = self._inflight
+        future = inflight.get(cache_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        inflight[cache_key] = future
+        try:
+            pr_info = await self._fetch_pr_info(owner, repo, pr_id, cache_key, _now_iso)
+        except asyncio.CancelledError:
+            # 发起者被取消时，等待者按获取失败处理
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 标记异常已被获取，避免没有等待者时输出警告
+            raise
+        else:
+            future.set_result(pr_info)
+            return pr_info
+        finally:
+            del inflight[cache_key]
+
+    async def _fetch_pr_info(self, owner: str, repo: str, pr_id: int, cache_key: CacheKey,
+                             now_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """请求 PR 详情并写入缓存，由 get_pr_info_async 在缓存未命中时调用"""
         async with self.semaphore:
-            await self._rate_limit_async()
-            async with gitee_api.GiteeAPIClient(self.config.get_api_url('gitee'), self.config.get_access_token('gitee')) as client:
-                pr_details = await client.get_pr_details(owner, repo, pr_id)
-                if pr_details:
-                    pr_info = {
-                        "pr_details": pr_details,
-                        "last_updated": datetime.now().isoformat()
-                    }
-                    await self.cache.set(cache_key, pr_info)
-                    logger.debug(f"异步获取并缓存 PR #{pr_id} 信息成功")
-                    return pr_info
-                logger.warning(f"异步获取 PR #{pr_id} 信息失败")
-                return None
+            client = self._get_gitee_client()
+            pr_details = await client.get_pr_details(owner, repo, pr_id)
+            if pr_details:
+                pr_info = {
+                    "pr_details": pr_details,
+                    "last_updated": now_iso or datetime.now().isoformat()
+                }
+                await self.cache.set(cache_key, pr_info)
+                logger.debug(f"异步获取并缓存 PR #{pr_id} 信息成功")
+                return pr_info
+            logger.warning(f"异步获取 PR #{pr_id} 信息失败")
+            # 短时间缓存失败结果，避免已删除或无权访问的PR被反复请求
+            await self.cache.set(cache_key, NEGATIVE, ttl=NEGATIVE_TTL)
+            return None
 
     async def get_multiple_pr_info_async(self, pr_list: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
-        start_time = time.time()
-        tasks = [self.get_pr_info_async(pr['owner'], pr['repo'], pr['pr_id']) for pr in pr_list]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        processed = []
-        for r in results:
-            if isinstance(r, Exception):
-                logger.error(f"获取 PR 信息时出现异常: {r}")
-                processed.append(None)
-            else:
-                processed.append(r)
-        elapsed = time.time() - start_time
-        success_count = sum(1 for r in processed if r is not None)
+        start_time = time.monotonic()
+        # 结果按输入位置写入预分配的列表，成功计数在任务完成时累加，无需在 gather 之后再遍历结果
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pr_list)
+        success_count = 0
+        # 同一批次的 last_updated 只格式化一次
+        now_iso = datetime.now().isoformat()
+        # 相同的PR只获取一次，结果写入它在输入中出现的所有位置
+        positions: Dict[Tuple[str, str, int], List[int]] = {}
+        for i, pr in enumerate(pr_list):
+            positions.setdefault((pr['owner'], pr['repo'], pr['pr_id']), []).append(i)
+
+        # 方法在循环外绑定为局部变量，避免每个PR重复查找属性
+        get_pr_info = self.get_pr_info_async
+        safe_await = async_runner.safe_await
+
+        async def fetch(key: Tuple[str, str, int], indexes: List[int]) -> None:
+            nonlocal success_count
+            info = await safe_await(get_pr_info(*key, _now_iso=now_iso), "获取 PR 信息")
+            if info is not None:
+                for index in indexes:
+                    results[index] = info
+                success_count += len(indexes)
+
+        # 固定数量的工作协程从同一迭代器中依次取任务，同时存在的协程数不超过窗口大小，
+        # 与分段 gather 不同，不会因等待某一段中最慢的请求而停顿
+        pending = iter(positions.items())
+
+        async def worker() -> None:
+            for key, indexes in pending:
+                await fetch(key, indexes)
+
+        window = min(len(positions), 4 * self.max_concurrent_requests)
+        if hasattr(asyncio, "TaskGroup"):
+            # 单个PR的异常已由 safe_await 转换为 None；TaskGroup 开销比 gather 小，
+            # 且外部取消（如停止服务）时会一并取消所有工作协程
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(window):
+                    tg.create_task(worker())
+        else:  # Python 3.11 以下没有 TaskGroup
+            await asyncio.gather(*(worker() for _ in range(window)))
+        elapsed = time.monotonic() - start_time
         logger.info(f"并发获取 {len(pr_list)} 个PR信息完成: {success_count} 成功, 耗时 {elapsed:.2f}s")
-        return processed
+        return results
 
     async def get_author_prs_async(self, owner: str, repo: str, author: str) -> List[Dict[str, Any]]:
+        # 逐页获取作者的PR，列表接口已返回完整字段的PR直接写入缓存，之后的批量获取只为缺少字段的PR请求详情
+        now_iso = datetime.now().isoformat()
+        pr_list = []
         async with self.semaphore:
-            await self._rate_limit_async()
-            async with gitee_api.GiteeAPIClient(self.config.get_api_url('gitee'), self.config.get_access_token('gitee')) as client:
-                prs = await client.get_author_prs(owner, repo, author)
-                if not prs:
-                    return []
-                pr_list = [{"owner": owner, "repo": repo, "pr_id": pr.get('number')} for pr in prs if pr.get('number')]
+            client = self._get_gitee_client()
+            async for pr in client.iter_author_prs(owner, repo, author):
+                pr_id = pr.get('number')
+                if not pr_id:
+                    continue
+                if PR_DETAIL_FIELDS <= pr.keys():
+                    await self.cache.set(("info", owner, repo, pr_id), {"pr_details": pr, "last_updated": now_iso})
+                pr_list.append({"owner": owner, "repo": repo, "pr_id": pr_id})
+        if not pr_list:
+            return []
         pr_info_list = await self.get_multiple_pr_info_async(pr_list)
         valid = [info for info in pr_info_list if info is not None]
         logger.info(f"异步获取作者 {author} 的 {len(valid)} 个PR信息完成")
@@ -1084,19 +1302,17 @@ class PRMonitor:
 
     async def add_pr_labels_async(self, owner: str, repo: str, pr_id: int, labels: List[str]) -> bool:
         async with self.semaphore:
-            await self._rate_limit_async()
-            async with gitee_api.GiteeAPIClient(self.config.get_api_url('gitee'), self.config.get_access_token('gitee')) as client:
-                result = await client.add_pr_labels(owner, repo, pr_id, labels)
-                success = result is not None
-                if success:
-                    await self.cache.invalidate(f"{owner}/{repo}#{pr_id}")
-                return success
+            client = self._get_gitee_client()
+            result = await client.add_pr_labels(owner, repo, pr_id, labels)
+            success = result is not None
+            if success:
+                await self.cache.invalidate(("info", owner, repo, pr_id))
+            return success
 
     async def remove_pr_label_async(self, owner: str, repo: str, pr_id: int, label: str) -> bool:
         async with self.semaphore:
-            await self._rate_limit_async()
-            async with gitee_api.GiteeAPIClient(self.config.get_api_url('gitee'), self.config.get_access_token('gitee')) as client:
-                success = await client.remove_pr_label(owner, repo, pr_id, label)
-                if success:
-                    await self.cache.invalidate(f"{owner}/{repo}#{pr_id}")
-                return success
+            client = self._get_gitee_client()
+            success = await client.remove_pr_label(owner, repo, pr_id, label)
+            if success:
+                await self.cache.invalidate(("info", owner, repo, pr_id))
+            return success
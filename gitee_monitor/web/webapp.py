@@ -3,12 +3,12 @@ Flask Web 应用模块，处理 Web 界面和 API 请求
 """
 import logging
 import re
-import json
-import asyncio
 from flask import Flask, request, render_template, redirect, url_for, jsonify, Response
 
+from ..config import fastjson
 from ..config.config_manager import Config
 from ..services.pr_monitor import PRMonitor
+from ..api import async_runner
 
 logger = logging.getLogger(__name__)
 
@@ -31,19 +31,8 @@ class WebApp:
         self._register_routes()
     
     def _run_async_in_thread(self, coro):
-        """在新线程中运行异步函数"""
-        def run_in_thread():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                return loop.run_until_complete(coro)
-            finally:
-                loop.close()
-        
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_in_thread)
-            return future.result()
+        """在后台事件循环中运行异步函数，复用共享的HTTP会话"""
+        return async_runner.run_sync(coro)
         
     def _register_routes(self) -> None:
         """注册路由"""
@@ -70,7 +59,6 @@ class WebApp:
                             self.config.set_platform_config('gitee', access_token=gitee_token)
                         if github_token:
                             self.config.set_platform_config('github', access_token=github_token)
-                        self.config.save_config()
                         # 重新初始化API客户端以应用新的访问令牌
                         self.pr_monitor.reinitialize_api_clients()
                         logger.info("API 配置更新完成，已重新初始化API客户端")
@@ -92,7 +80,6 @@ class WebApp:
                             pr_id = int(match.group(3))
                             
                             self.config.add_pr(owner, repo, pr_id)
-                            self.config.save_config()
                             logger.info(f"通过 URL 添加 PR #{pr_id} ({owner}/{repo}) 到监控列表")
                 elif action == 'add_followed_author':
                     platform = request.form.get('platform', '').strip()
@@ -107,7 +94,6 @@ class WebApp:
                             error = '仓库格式不正确，应为 owner/repo 格式'
                         else:
                             self.config.add_followed_author(author, repo, platform)
-                            self.config.save_config()
                             # 重新初始化API客户端，确保新平台的客户端可用
                             self.pr_monitor.reinitialize_api_clients()
                             logger.info(f"通过表单添加关注作者 {author} 的仓库 {repo} (平台: {platform})，已重新初始化API客户端")
@@ -124,7 +110,6 @@ class WebApp:
                 if owner and repo and pr_id and pr_id.isdigit():
                     pr_id = int(pr_id)
                     self.config.remove_pr(owner, repo, pr_id, platform)
-                    self.config.save_config()
                     logger.info(f"删除 {platform.upper()} PR #{pr_id} ({owner}/{repo}) 从监控列表")
                 return redirect(url_for('config_page'))
                 
@@ -134,7 +119,6 @@ class WebApp:
                 
                 if author and repo:
                     self.config.remove_followed_author(author, repo)
-                    self.config.save_config()
                     logger.info(f"删除关注作者 {author} 的仓库 {repo}")
                 return redirect(url_for('config_page'))
             
@@ -226,7 +210,7 @@ class WebApp:
             
             # 使用异步监控器并发获取所有PR信息
             async def get_pr_data():
-                start_time = time.time()
+                start_time = time.monotonic()
                 logger.info(f"开始获取 {len(pr_list)} 个PR的信息...")
                 
                 results = await self.pr_monitor.get_multiple_pr_info_async(pr_list)
@@ -244,7 +228,7 @@ class WebApp:
                             "pr_details": pr_info['pr_details']
                         }
                 
-                end_time = time.time()
+                end_time = time.monotonic()
                 elapsed = end_time - start_time
                 logger.info(f"获取完成: {len(pr_data)} 个PR信息，耗时 {elapsed:.2f}s")
                 
@@ -313,15 +297,15 @@ class WebApp:
                 total_prs = len(pr_list)
                 
                 # 发送开始事件
-                yield f"event: start\ndata: {json.dumps({'total': total_prs, 'async': True})}\n\n"
+                yield f"event: start\ndata: {fastjson.dumps_str({'total': total_prs, 'async': True})}\n\n"
                 
                 if total_prs == 0:
-                    yield f"event: complete\ndata: {json.dumps({'message': 'No PRs to load'})}\n\n"
+                    yield f"event: complete\ndata: {fastjson.dumps_str({'message': 'No PRs to load'})}\n\n"
                     return
                 
                 # 异步获取所有PR信息
                 async def get_all_pr_data():
-                    start_time = time.time()
+                    start_time = time.monotonic()
                     
                     # 创建进度回调
                     def progress_callback(completed, total):
@@ -336,7 +320,7 @@ class WebApp:
                     
                     results = await self.pr_monitor.get_multiple_pr_info_async(pr_list)
                     
-                    end_time = time.time()
+                    end_time = time.monotonic()
                     elapsed = end_time - start_time
                     
                     return results, elapsed
@@ -360,7 +344,7 @@ class WebApp:
                                 "pr_id": pr_item['pr_id'],
                                 "pr_details": pr_info['pr_details']
                             }
-                            yield f"event: pr_data\ndata: {json.dumps(pr_data)}\n\n"
+                            yield f"event: pr_data\ndata: {fastjson.dumps_str(pr_data)}\n\n"
                         else:
                             error_data = {
                                 "cache_key": cache_key,
@@ -370,7 +354,7 @@ class WebApp:
                                 "repo": pr_item['repo'],
                                 "pr_id": pr_item['pr_id']
                             }
-                            yield f"event: pr_error\ndata: {json.dumps(error_data)}\n\n"
+                            yield f"event: pr_error\ndata: {fastjson.dumps_str(error_data)}\n\n"
                         
                         processed += 1
                         progress_data = {
@@ -378,7 +362,7 @@ class WebApp:
                             "total": total_prs,
                             "percentage": round((processed / total_prs) * 100, 1)
                         }
-                        yield f"event: progress\ndata: {json.dumps(progress_data)}\n\n"
+                        yield f"event: progress\ndata: {fastjson.dumps_str(progress_data)}\n\n"
                     
                     # 发送完成事件
                     complete_data = {
@@ -386,11 +370,11 @@ class WebApp:
                         'elapsed': elapsed,
                         'total': total_prs
                     }
-                    yield f"event: complete\ndata: {json.dumps(complete_data)}\n\n"
+                    yield f"event: complete\ndata: {fastjson.dumps_str(complete_data)}\n\n"
                     
                 except Exception as e:
                     error_data = {'error': str(e)}
-                    yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
+                    yield f"event: error\ndata: {fastjson.dumps_str(error_data)}\n\n"
                     logger.error(f"流式获取PR数据失败: {e}")
             
             return Response(generate(), mimetype='text/event-stream',
@@ -440,7 +424,6 @@ class WebApp:
                 }), 400
             
             self.config.add_pr(owner, repo, pr_id, platform)
-            self.config.save_config()
             logger.info(f"通过 API 添加 {platform.upper()} PR #{pr_id} ({owner}/{repo}) 到监控列表")
             
             # 获取新添加PR的详细信息
@@ -450,7 +433,8 @@ class WebApp:
                 logger.warning(f"获取新添加{platform.upper()}PR的信息失败: {e}")
                 pr_details = None
             
-            return jsonify({
+            # PR 详情由 orjson 直接序列化，不经过中间字典
+            return Response(fastjson.dumps({
                 'success': True, 
                 'message': f'{platform.upper()} PR 添加成功',
                 'pr_data': {
@@ -458,10 +442,10 @@ class WebApp:
                     'owner': owner,
                     'repo': repo,
                     'pr_id': pr_id,
-                    'pr_details': pr_details.to_dict() if pr_details else None,
+                    'pr_details': pr_details,
                     'cache_key': f"{platform}:{owner}/{repo}#{pr_id}"
                 }
-            })
+            }), mimetype='application/json')
         
         # 删除 PR API 端点
         @self.app.route('/api/delete_pr', methods=['DELETE'])
@@ -478,7 +462,6 @@ class WebApp:
             try:
                 pr_id = int(pr_id)
                 self.config.remove_pr(owner, repo, pr_id, platform)
-                self.config.save_config()
                 logger.info(f"通过 API 删除 {platform.upper()} PR #{pr_id} ({owner}/{repo}) 从监控列表")
                 return jsonify({'success': True, 'message': f'{platform.upper()} PR 删除成功'})
             except ValueError:
@@ -498,7 +481,6 @@ class WebApp:
                 self.config.set_platform_config('gitee', access_token=gitee_access_token)
             if github_access_token:
                 self.config.set_platform_config('github', access_token=github_access_token)
-            self.config.save_config()
             # 重新初始化API客户端以应用新的访问令牌
             self.pr_monitor.reinitialize_api_clients()
             logger.info("通过 API 更新多平台 API 配置，已重新初始化API客户端")
@@ -511,9 +493,8 @@ class WebApp:
             force_refresh = request.args.get('force_refresh', '').lower() == 'true'
             # 获取关注作者的PR并自动添加到监控列表
             prs = self.pr_monitor.get_followed_author_prs(force_refresh=force_refresh, auto_add_to_monitor=True)
-            # 将PullRequest对象转换为字典格式
-            prs_data = [pr.to_dict() for pr in prs]
-            return jsonify(prs_data)
+            # PullRequest 对象由 orjson 直接序列化为 JSON
+            return Response(fastjson.dumps(prs), mimetype='application/json')
         
         # 添加关注作者 API 端点
         @self.app.route('/api/add_followed_author', methods=['POST'])
@@ -531,7 +512,6 @@ class WebApp:
                 return jsonify({'success': False, 'error': '仓库格式不正确，应为 owner/repo 格式'}), 400
                 
             self.config.add_followed_author(author, repo, platform)
-            self.config.save_config()
             # 重新初始化API客户端，确保新平台的客户端可用
             self.pr_monitor.reinitialize_api_clients()
             logger.info(f"通过 API 添加关注作者 {author} 的仓库 {repo} (平台: {platform})，已重新初始化API客户端")
@@ -539,14 +519,11 @@ class WebApp:
             # 获取新添加作者的PR列表
             try:
                 owner, repo_name = repo.split('/', 1)
-                # 使用对应平台的API客户端
-                from ..api.api_client_factory import APIClientFactory
-                api_client = APIClientFactory.create_client(platform)
+                # 使用监控服务中对应平台的API客户端，复用其连接池和响应缓存
+                api_client = self.pr_monitor.api_clients.get(platform)
                 if api_client:
-                    prs_data = api_client.get_author_prs(owner, repo_name, author)
-                    prs = []
-                    if prs_data:
-                        prs = [pr_data for pr_data in prs_data]  # 保持原始数据格式
+                    # 保持原始数据格式
+                    prs = self._run_async_in_thread(api_client.get_author_prs(owner, repo_name, author)) or []
                 else:
                     prs = []
             except Exception as e:
@@ -576,7 +553,6 @@ class WebApp:
                 return jsonify({'success': False, 'error': '缺少必要参数'}), 400
             
             self.config.remove_followed_author(author, repo, platform)
-            self.config.save_config()
             logger.info(f"通过 API 删除关注作者 {author} 的仓库 {repo} (平台: {platform})")
             return jsonify({'success': True, 'message': '关注作者删除成功'})
         
@@ -623,10 +599,10 @@ class WebApp:
                 if poll_interval is not None:
                     config_updates['POLL_INTERVAL'] = poll_interval
                 
-                # 保存配置
-                for key, value in config_updates.items():
-                    self.config.set(key, value)
-                self.config.save_config()
+                # 批量更新配置，只保存一次
+                with self.config.batch_update():
+                    for key, value in config_updates.items():
+                        self.config.set(key, value)
                 
                 logger.info(f"通过 API 更新性能配置: {config_updates}")
                 
@@ -659,8 +635,8 @@ class WebApp:
             try:
                 automation_engine = self.pr_monitor.get_automation_engine()
                 rules = automation_engine.get_rules()
-                rules_data = [rule.to_dict() for rule in rules]
-                return jsonify(rules_data)
+                # 规则对象（含嵌套的条件、动作、时间）由 orjson 直接遍历序列化，不逐层构造中间字典
+                return Response(fastjson.dumps(rules), mimetype='application/json')
             except Exception as e:
                 logger.error(f"获取自动化规则失败: {e}")
                 return jsonify({'error': str(e)}), 500
@@ -763,8 +739,7 @@ class WebApp:
                 limit = int(request.args.get('limit', 100))
                 
                 history = automation_engine.get_execution_history(rule_id, limit)
-                history_data = [record.to_dict() for record in history]
-                return jsonify(history_data)
+                return Response(fastjson.dumps(history), mimetype='application/json')
             except Exception as e:
                 logger.error(f"获取自动化执行历史失败: {e}")
                 return jsonify({'error': str(e)}), 500